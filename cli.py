@@ -23,7 +23,6 @@ import os
 import argparse
 import struct
 import csv
-import re
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, List, Dict
@@ -66,6 +65,9 @@ except ImportError:
     HAS_CALENDAR_MODULE = False
     CALENDAR_MESSAGE_CLASSES = []
 
+# Characters not allowed in Windows file names, mapped to '_' via str.translate
+_FILENAME_UNSAFE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
 
 def get_column_map(table) -> Dict[str, int]:
     """Get mapping of column names to indices."""
@@ -85,7 +87,7 @@ def get_filetime(record, col_idx: int) -> Optional[datetime]:
         val = record.get_value_data(col_idx)
         if not val or len(val) != 8:
             return None
-        filetime = struct.unpack('<Q', val)[0]
+        filetime = int.from_bytes(val, 'little')
         if filetime == 0:
             return None
         EPOCH_DIFF = 116444736000000000
@@ -381,10 +383,8 @@ class EDBExporter:
                 tables=self.tables, mailbox_num=mailbox_num
             )
 
-            eml_content = email_msg.to_eml()
-
             with open(output_path, 'wb') as f:
-                f.write(eml_content)
+                email_msg.write_eml(f)
 
             return True
         except Exception as e:
@@ -443,13 +443,11 @@ class EDBExporter:
 
                 # Generate filename
                 date_str = date_received.strftime("%Y%m%d_%H%M%S") if date_received else "nodate"
-                subject_safe = re.sub(r'[<>:"/\\|?*]', '_', email_msg.subject or 'no_subject')[:40]
+                subject_safe = (email_msg.subject or 'no_subject').translate(_FILENAME_UNSAFE)[:40]
                 filename = f"{date_str}_{i}_{subject_safe}.eml"
 
-                eml_content = email_msg.to_eml()
-
                 with open(Path(output_dir) / filename, 'wb') as f:
-                    f.write(eml_content)
+                    email_msg.write_eml(f)
 
                 exported += 1
 
@@ -504,6 +502,7 @@ class EDBExporter:
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
         exported = 0
+        folder_dirs = {}  # folder_id -> created output directory
 
         for i in range(msg_table.get_number_of_records()):
             try:
@@ -525,7 +524,6 @@ class EDBExporter:
 
                 # Get folder path
                 folder_path = get_folder_path(folder_id)
-                safe_parts = [re.sub(r'[<>:"/\\|?*]', '_', p) for p in folder_path.split('/')]
 
                 email_msg = extractor.extract_message(
                     rec, col_map, i,
@@ -533,21 +531,21 @@ class EDBExporter:
                     tables=self.tables, mailbox_num=mailbox_num
                 )
 
-                # Create folder directory
-                folder_dir = Path(output_dir)
-                for part in safe_parts:
-                    folder_dir = folder_dir / part
-                folder_dir.mkdir(parents=True, exist_ok=True)
+                # Create folder directory once per folder
+                folder_dir = folder_dirs.get(folder_id)
+                if folder_dir is None:
+                    folder_dir = Path(output_dir).joinpath(
+                        *(p.translate(_FILENAME_UNSAFE) for p in folder_path.split('/')))
+                    folder_dir.mkdir(parents=True, exist_ok=True)
+                    folder_dirs[folder_id] = folder_dir
 
                 # Generate filename
                 date_str = date_received.strftime("%Y%m%d_%H%M%S") if date_received else "nodate"
-                subject_safe = re.sub(r'[<>:"/\\|?*]', '_', email_msg.subject or 'no_subject')[:40]
+                subject_safe = (email_msg.subject or 'no_subject').translate(_FILENAME_UNSAFE)[:40]
                 filename = f"{date_str}_{i}_{subject_safe}.eml"
 
-                eml_content = email_msg.to_eml()
-
                 with open(folder_dir / filename, 'wb') as f:
-                    f.write(eml_content)
+                    email_msg.write_eml(f)
 
                 exported += 1
 
@@ -6,6 +6,7 @@ Based on Windows ESE (Extensible Storage Engine) documentation.
 Provides high-level interface for reading Exchange mailbox data.
 """
 
+import re
 import struct
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any, Tuple
@@ -310,6 +311,19 @@ class ESEReader:
                 yield msg
 
 
+# Subject text: a NUL before a digit also emits that digit (compression marker)
+_SUBJECT_NUL_DIGIT_RE = re.compile(rb'\x00(?=([0-9]))')
+_SUBJECT_HIGH_BYTE_RE = re.compile(rb'[\x80-\xff]')
+# Bytes dropped from subject text: non-printable ASCII and '!' (compression marker)
+_SUBJECT_DROP = bytes(b for b in range(256) if not 0x20 <= b <= 0x7e or b == 0x21)
+
+# Searched on decoded text so \w covers Unicode domains and invalid bytes are dropped first
+_MESSAGE_ID_RE = re.compile(r'<([a-f0-9]+@[\w\.-]+)>')
+
+_SENDER_STRING_RE = re.compile(rb'[\x20-\x7e]{3,}')
+_SENDER_EMAIL_RE = re.compile(r'<?([\w\.-]+@[\w\.-]+\.\w+)>?')
+
+
 def extract_subject_from_property_blob(data: bytes) -> str:
     """
     Extract subject from PropertyBlob.
@@ -348,43 +362,22 @@ def extract_subject_from_property_blob(data: bytes) -> str:
     if hh_pos > 0:
         end_pos = hh_pos
 
-    # Also look for 0x1a or high control bytes as end
-    for i in range(subject_start, min(subject_start + 100, len(data))):
-        if data[i] == 0x1a or (data[i] >= 0x80 and i > subject_start + 3):
-            end_pos = min(end_pos, i)
-            break
+    # Also look for 0x1a (anywhere) or a high byte (after the first 4 bytes)
+    # within the first 100 bytes as end
+    window = data[subject_start:subject_start + 100]
+    ctrl = window.find(b'\x1a')
+    if ctrl >= 0:
+        end_pos = min(end_pos, subject_start + ctrl)
+    high = _SUBJECT_HIGH_BYTE_RE.search(window, 4)
+    if high:
+        end_pos = min(end_pos, subject_start + high.start())
 
     subject_bytes = data[subject_start:end_pos]
 
-    # Extract printable characters, handling compression markers
-    subject_parts = []
-    current_word = []
-
-    for i, b in enumerate(subject_bytes):
-        # Printable character (but not "!" which is compression marker)
-        if 0x20 <= b <= 0x7e and b != ord('!'):
-            current_word.append(chr(b))
-        # "!" followed by null+digit is compression - skip the marker
-        elif b == ord('!'):
-            # Flush current word
-            if current_word:
-                subject_parts.append(''.join(current_word))
-                current_word = []
-        # Null or control - word boundary
-        elif b == 0x00 or b < 0x20:
-            if current_word:
-                subject_parts.append(''.join(current_word))
-                current_word = []
-            # If followed by digit after null, add the digit
-            if b == 0x00 and i + 1 < len(subject_bytes):
-                next_b = subject_bytes[i + 1]
-                if 0x30 <= next_b <= 0x39:  # Digit
-                    subject_parts.append(chr(next_b))
-
-    if current_word:
-        subject_parts.append(''.join(current_word))
-
-    subject = ''.join(subject_parts)
+    # Keep printable characters, dropping "!" compression markers and control
+    # bytes; a null followed by a digit also contributes that digit
+    subject_bytes = _SUBJECT_NUL_DIGIT_RE.sub(rb'\1', subject_bytes)
+    subject = subject_bytes.translate(None, _SUBJECT_DROP).decode('ascii')
 
     # Clean up
     subject = subject.strip()
@@ -401,29 +394,9 @@ def extract_sender_from_property_blob(data: bytes) -> str:
     if not data or len(data) < 10:
         return ""
 
-    import re
-
-    # First look for email address
-    text = data.decode('utf-8', errors='ignore')
-    emails = re.findall(r'<?([\w\.-]+@[\w\.-]+\.\w+)>?', text)
-
-    # Find readable strings
-    strings = []
-    current = []
-
-    for b in data:
-        if 32 <= b <= 126:
-            current.append(chr(b))
-        else:
-            if len(current) >= 3:
-                strings.append(''.join(current))
-            current = []
-
-    if current and len(current) >= 3:
-        strings.append(''.join(current))
-
-    # Look for sender name patterns
-    for s in strings:
+    # Look for sender name patterns in readable strings
+    for match in _SENDER_STRING_RE.finditer(data):
+        s = match.group().decode('ascii')
         # Pattern: "ministratorM" -> "Administrator"
         if 'ministrator' in s.lower():
             return "Administrator"
@@ -435,8 +408,9 @@ def extract_sender_from_property_blob(data: bytes) -> str:
                 return name
 
     # Return email if found
-    if emails:
-        return emails[0]
+    email = _SENDER_EMAIL_RE.search(data.decode('utf-8', errors='ignore'))
+    if email:
+        return email.group(1)
 
     return ""
 
@@ -450,11 +424,14 @@ def extract_message_id_from_property_blob(data: bytes) -> str:
     if not data:
         return ""
 
-    import re
+    # No '@' byte means no match; skip the decode ('@' survives errors='ignore')
+    if b'@' not in data:
+        return ""
+
     text = data.decode('utf-8', errors='ignore')
 
     # Look for Message-ID pattern
-    match = re.search(r'<([a-f0-9]+@[\w\.-]+)>', text)
+    match = _MESSAGE_ID_RE.search(text)
     if match:
         return f"<{match.group(1)}>"
 
@@ -175,6 +175,10 @@ def decode_repeat_pattern(data: bytes) -> str:
     return result
 
 
+# 'M' marker, then a length byte below 0x40, then a printable character
+_SENDER_END_MARKER_RE = re.compile(rb'M[\x00-\x3f][\x20-\x7e]')
+
+
 def extract_subject_and_body(data: bytes) -> tuple:
     """
     Extract subject and body from PropertyBlob using repeat pattern decoding.
@@ -206,12 +210,10 @@ def extract_subject_and_body(data: bytes) -> tuple:
 
     # Alternative: find 'M' followed by length byte and printable char
     if sender_end < 0:
-        for i in range(len(data) - 3):
-            if (data[i] == 0x4d and  # 'M'
-                data[i + 1] < 0x40 and  # Length byte (typically < 64)
-                32 <= data[i + 2] <= 126):  # Printable char
-                sender_end = i + 1
-                break
+        # Stop one byte short of the end, as the old byte loop did
+        match = _SENDER_END_MARKER_RE.search(data, 0, len(data) - 1)
+        if match:
+            sender_end = match.start() + 1
 
     if sender_end < 0:
         return ("", "")
@@ -1082,6 +1084,17 @@ def _decompress_exchange_lz77(data: bytes, expected_size: int = 0) -> bytes:
     return bytes(output)
 
 
+# Style fragments that leak into text between tags
+_CSS_TEXT_RE = re.compile(r'margin|padding|font-|color:|style|display')
+
+
+def _printable_text(text: str) -> str:
+    """Keep printable characters plus CR/LF/TAB."""
+    if text.isprintable():
+        return text
+    return ''.join(c for c in text if c.isprintable() or c in '\r\n\t')
+
+
 def extract_text_from_html(html_bytes: bytes) -> str:
     """
     Extract visible text content from HTML bytes.
@@ -1266,31 +1279,23 @@ def extract_text_from_html(html_bytes: bytes) -> str:
         result = re.sub(r'\n\s*\n', '\n\n', result)
         return result.strip()
 
-    # Fallback: General text extraction between any tags
+    # Fallback: General text extraction between any tags. Every piece after a
+    # '<' starts with the tag body up to '>'; stray '>' outside tags are dropped
     text_parts = []
-    in_tag = False
-    current = []
-
-    for c in html:
-        if c == '<':
-            if current:
-                text = ''.join(current).strip()
-                if text and len(text) >= 2:
-                    # Skip CSS-like content
-                    if not any(x in text.lower() for x in ['margin', 'padding', 'font-', 'color:', 'style', 'display']):
-                        text_parts.append(text)
-                current = []
-            in_tag = True
-        elif c == '>':
-            in_tag = False
-        elif not in_tag:
-            if c.isprintable() or c in '\r\n\t':
-                current.append(c)
-
-    if current:
-        text = ''.join(current).strip()
+    pieces = html.split('<')
+    last = len(pieces) - 1
+
+    for n, piece in enumerate(pieces):
+        if n:
+            tag_end = piece.find('>')
+            if tag_end < 0:
+                continue  # Unterminated tag
+            piece = piece[tag_end + 1:]
+        text = _printable_text(piece.replace('>', '')).strip()
         if text and len(text) >= 2:
-            text_parts.append(text)
+            # Skip CSS-like content (the trailing piece was never filtered)
+            if n == last or not _CSS_TEXT_RE.search(text.lower()):
+                text_parts.append(text)
 
     # Clean up and join
     result = '\n'.join(t for t in text_parts if t)
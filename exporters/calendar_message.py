@@ -4,7 +4,6 @@ Calendar Message Extraction Module for Exchange EDB databases.
 Extracts calendar/appointment data and exports to iCalendar (.ics) format.
 """
 
-import struct
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List
@@ -20,6 +19,13 @@ except ImportError:
     HAS_DISSECT = False
 
 
+# Attendee email addresses in decoded PropertyBlob text
+_ATTENDEE_EMAIL_RE = re.compile(r'[\w.-]+@[\w.-]+\.\w+')
+
+# Bytes outside printable ASCII (0x20-0x7e), for bytes.translate/lstrip
+_NONPRINTABLE_ASCII = bytes(b for b in range(256) if not 32 <= b <= 126)
+
+
 # Calendar message class patterns
 CALENDAR_MESSAGE_CLASSES = [
     'IPM.Appointment',
@@ -362,14 +368,13 @@ class CalendarExtractor:
 
     def _extract_printable_text(self, data: bytes, max_len: int = 200) -> str:
         """Extract printable ASCII text from bytes."""
-        result = []
-        for b in data:
-            if 32 <= b < 127:
-                result.append(chr(b))
-            elif result and b == 0:
-                break  # Null terminator
-
-        text = ''.join(result).strip()
+        # Text starts at the first printable byte and ends at the next null terminator
+        data = data.lstrip(_NONPRINTABLE_ASCII)
+        end = data.find(b'\x00')
+        if end >= 0:
+            data = data[:end]
+
+        text = data.translate(None, _NONPRINTABLE_ASCII).decode('ascii').strip()
         return text[:max_len] if text else ""
 
     def _extract_times_from_blob(self, event: CalendarEvent, blob: bytes):
@@ -382,13 +387,10 @@ class CalendarExtractor:
 
     def _extract_attendees_from_blob(self, event: CalendarEvent, blob: bytes):
         """Try to extract attendees from PropertyBlob."""
-        # Look for email patterns
-        email_pattern = rb'[\w.-]+@[\w.-]+\.\w+'
-
         try:
             # Decode blob for regex
             text = blob.decode('utf-8', errors='ignore')
-            emails = re.findall(r'[\w.-]+@[\w.-]+\.\w+', text)
+            emails = _ATTENDEE_EMAIL_RE.findall(text)
 
             for email in emails[:10]:  # Limit to 10 attendees
                 if email != self.mailbox_email:  # Skip organizer
@@ -416,7 +418,7 @@ class CalendarExtractor:
             if not val or len(val) != 8:
                 return None
 
-            filetime = struct.unpack('<Q', val)[0]
+            filetime = int.from_bytes(val, 'little')
             if filetime == 0:
                 return None
 
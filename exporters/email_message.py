@@ -9,15 +9,88 @@ Creates proper RFC 5322 compliant EML files with all headers and body content.
 import struct
 import re
 from datetime import datetime, timezone
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
 from email.utils import format_datetime, formataddr
-from email import encoders
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from typing import Optional, List, Tuple, Dict
 
 
+@lru_cache(maxsize=None)
+def _mime_modules():
+    """Import the MIME builders on first EML export rather than at startup."""
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.base import MIMEBase
+    from email.generator import BytesGenerator
+    from email import encoders
+    return MIMEMultipart, MIMEText, MIMEBase, BytesGenerator, encoders
+
+
+@lru_cache(maxsize=1024)
+def _placeholder_email(name: str) -> str:
+    """Build the name@unknown address used when no real address is known."""
+    return f"{name.lower().replace(' ', '')}@unknown"
+
+
+# Message-ID candidate: '<' up to the first '>' within 100 bytes, ASCII only.
+# Zero-width so every '<' is tried, including ones inside an earlier candidate.
+_MESSAGE_ID_RE = re.compile(rb'(?=(<[\x00-\x3d\x3f-\x7f]{0,98}>))')
+
+# Attachment filename extensions in lookup priority order, searched in one pass.
+# Longest alternatives first; a '.docx' hit also counts as a '.doc' occurrence.
+_ATTACHMENT_EXTENSIONS = (b'.txt', b'.xml', b'.doc', b'.docx', b'.pdf', b'.jpg',
+                          b'.png', b'.xlsx', b'.xls', b'.zip', b'.eml', b'.msg')
+_ATTACHMENT_EXT_RE = re.compile(
+    b'|'.join(re.escape(ext) for ext in sorted(_ATTACHMENT_EXTENSIONS, key=len, reverse=True)),
+    re.IGNORECASE)
+_ATTACHMENT_EXT_PREFIXES = {ext: tuple(e for e in _ATTACHMENT_EXTENSIONS if ext.startswith(e))
+                            for ext in _ATTACHMENT_EXTENSIONS}
+
+# Attachment MIME types in lookup priority order, searched in one pass
+_ATTACHMENT_MIME_TYPES = (b'text/plain', b'text/html', b'application/pdf', b'image/jpeg', b'image/png')
+_ATTACHMENT_MIME_RE = re.compile(b'|'.join(map(re.escape, _ATTACHMENT_MIME_TYPES)))
+
+# Sender name checks via bytes.translate: bytes that are not ASCII letters or
+# space (deleted to count letters), and the ASCII letters/whitespace a name may hold
+_NON_NAME_LETTER_BYTES = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122 or b == 32))
+_ASCII_NAME_CHARS = bytes(b for b in range(128) if chr(b).isalpha() or chr(b).isspace())
+# Bytes deleted via bytes.translate to keep printable ASCII, with or without tab/LF/CR
+_NONPRINTABLE_ASCII = bytes(b for b in range(256) if not 32 <= b <= 126)
+_NONPRINTABLE = bytes(b for b in range(256) if not (32 <= b <= 126 or b in (9, 10, 13)))
+# Control bytes other than tab/LF/CR, deleted via bytes.translate to count them
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 13))
+# SubobjectsBlob Inid references: 0x21 followed by the Inid byte
+_SUBOBJ_INID_RE = re.compile(rb'\x21(.)', re.DOTALL)
+# Folder/system names that rule out an M marker as a sender name
+_SENDER_SKIP_RE = re.compile(rb'Junk|Inbox|Sent|Deleted|Drafts|Microsoft|Exchange|System|Recovery|'
+                             rb'Calendar|Contacts|Tasks|/O=|/OU=|CN=|Rule|http|schema')
+
+# Precompiled little-endian integer format
+_U32 = struct.Struct('<I')
+
+_RECIPIENT_SPLIT_RE = re.compile(r'[;\n\r]+')
+_NAME_ADDR_RE = re.compile(r'^([^<]+)\s*<([^>]+)>')
+_CN_IDENTIFIER_RE = re.compile(r'^[0-9a-f]{20,}-')  # hex-dash-name CN entries
+# System path fragments that are never a subject ('nistrative' covers 'administrative')
+_SUBJECT_SKIP_RE = re.compile(r'fydib|recipients|cn=|/o=|/ou=|nistrative|indexing|bigfunnel')
+_PRINTABLE_RUN_RE = re.compile(rb'[\x20-\x7e]{10,}')
+
+
+class _BufferWriter:
+    """File-like writer that fills a bytearray from the start, growing it only when needed."""
+    __slots__ = ('buf', 'pos')
+
+    def __init__(self, buf: bytearray):
+        self.buf = buf
+        self.pos = 0
+
+    def write(self, data: bytes):
+        end = self.pos + len(data)
+        self.buf[self.pos:end] = data
+        self.pos = end
+
+
 @dataclass
 class EmailAttachment:
     """Represents an email attachment."""
@@ -80,6 +153,7 @@ class EmailMessage:
 
     # Raw data for debugging
     _raw_property_blob: bytes = field(default=b'', repr=False)
+    _decompressed_property_blob: bytes = field(default=b'', repr=False)
 
     def get_from_header(self) -> str:
         """Get formatted From header."""
@@ -88,7 +162,7 @@ class EmailMessage:
         elif self.sender_email:
             return self.sender_email
         elif self.sender_name:
-            return f"{self.sender_name} <{self.sender_name.lower().replace(' ', '')}@unknown>"
+            return f"{self.sender_name} <{_placeholder_email(self.sender_name)}>"
         return "unknown@unknown"
 
     def get_to_header(self) -> str:
@@ -128,6 +202,40 @@ class EmailMessage:
         Returns:
             EML content as bytes
         """
+        return self._build_mime().as_bytes()
+
+    def to_eml_into(self, buf: bytearray) -> int:
+        """
+        Export message to EML format into a reusable buffer.
+
+        The buffer is overwritten from the start and only grows; bytes past
+        the returned length are left over from earlier messages.
+
+        Args:
+            buf: Buffer to serialize into
+
+        Returns:
+            Number of EML bytes at the start of buf
+        """
+        writer = _BufferWriter(buf)
+        self.write_eml(writer)
+        return writer.pos
+
+    def write_eml(self, fp) -> None:
+        """
+        Write message in EML format straight to a binary file object.
+
+        Args:
+            fp: Binary file-like object (only write() is used)
+        """
+        msg = self._build_mime()
+        BytesGenerator = _mime_modules()[3]
+        BytesGenerator(fp, mangle_from_=False, policy=msg.policy).flatten(msg)
+
+    def _build_mime(self):
+        """Build the MIME message tree with all headers set."""
+        MIMEMultipart, MIMEText, MIMEBase, _, encoders = _mime_modules()
+
         # Determine message structure
         has_html = bool(self.body_html and self.body_html.strip())
         has_text = bool(self.body_text and self.body_text.strip())
@@ -214,7 +322,7 @@ class EmailMessage:
             sensitivity_map = {1: 'Personal', 2: 'Private', 3: 'Company-Confidential'}
             msg['Sensitivity'] = sensitivity_map.get(self.sensitivity, 'Normal')
 
-        return msg.as_bytes()
+        return msg
 
     def get_summary(self) -> str:
         """Get a text summary of the message."""
@@ -307,21 +415,21 @@ class EmailExtractor:
             mailbox_email: Default sender email for fallback
         """
         self.mailbox_owner = mailbox_owner
-        self.mailbox_email = mailbox_email or f"{mailbox_owner.lower().replace(' ', '')}@unknown" if mailbox_owner else ""
+        self.mailbox_email = mailbox_email or _placeholder_email(mailbox_owner) if mailbox_owner else ""
+        # mailbox_num -> (attach_table, attach_col_map, inid_map)
+        self._attachment_index_cache = {}
 
     def is_encrypted(self, data: bytes) -> bool:
         """Check if data appears to be encrypted/binary."""
         if not data or len(data) < 2:
             return False
 
-        control_count = sum(1 for b in data if b < 32 and b not in (9, 10, 13))
-        high_byte_count = sum(1 for b in data if b >= 128)
-
         # Encrypted if starts with control char and has high bytes
-        if data[0] < 32 and high_byte_count > 0:
+        if data[0] < 32 and not data.isascii():
             return True
 
         # Encrypted if >30% control characters
+        control_count = len(data) - len(data.translate(None, _CONTROL_BYTES))
         if control_count > len(data) * 0.3:
             return True
 
@@ -339,7 +447,7 @@ class EmailExtractor:
         if len(data) >= 4 and data[1] == 0 and data[3] == 0:
             try:
                 text = data.decode('utf-16-le').rstrip('\x00')
-                if text and all(c.isprintable() or c.isspace() for c in text):
+                if text and (text.isprintable() or ''.join(text.split()).isprintable()):
                     return text
             except:
                 pass
@@ -379,6 +487,37 @@ class EmailExtractor:
 
         return ""
 
+    def _decompress_blob(self, blob: bytes) -> bytes:
+        """Decompress a PropertyBlob, returning it unchanged if that fails."""
+        try:
+            from dissect.esedb.compression import decompress as dissect_decompress
+            return dissect_decompress(blob)
+        except:
+            return blob
+
+    def extract_blob_fields(self, blob: bytes) -> Tuple[str, str, str, bytes]:
+        """
+        Extract all sender-related fields from PropertyBlob in one go.
+
+        The blob is decompressed once and the M marker scan finds the sender
+        name and email in the same pass.
+
+        Args:
+            blob: Raw PropertyBlob data
+
+        Returns:
+            Tuple of (sender_name, sender_email, message_id, decompressed_blob)
+        """
+        if not blob:
+            return "", "", "", b''
+
+        decompressed = self._decompress_blob(blob)
+        sender_name, sender_email = "", ""
+        if len(blob) >= 50:
+            sender_name, sender_email = self._scan_sender_fields(decompressed)
+
+        return sender_name, sender_email, self._extract_message_id(blob), decompressed
+
     def _extract_sender(self, blob: bytes) -> str:
         """
         Extract sender name from PropertyBlob using M marker pattern.
@@ -390,101 +529,99 @@ class EmailExtractor:
         if not blob or len(blob) < 50:
             return ""
 
-        # Try to decompress blob first
-        try:
-            from dissect.esedb.compression import decompress as dissect_decompress
-            blob = dissect_decompress(blob)
-        except:
-            pass
+        return self._scan_sender_fields(self._decompress_blob(blob))[0]
 
-        # Search for M marker pattern with name-like content
-        # Look for M + length (5-30) + ASCII text that looks like a name
-        for i in range(len(blob) - 10):
-            if blob[i] == ord('M') and 5 <= blob[i+1] <= 40:
-                length = blob[i+1]
-                if i + 2 + length > len(blob):
-                    continue
+    def _extract_sender_email(self, blob: bytes) -> str:
+        """
+        Extract sender email from PropertyBlob using M marker pattern.
 
-                text_data = blob[i+2:i+2+length]
+        Looks for M + length + email@domain pattern.
+        """
+        if not blob or len(blob) < 50:
+            return ""
 
-                # Check if this looks like a name (mostly letters and spaces)
-                if not text_data:
-                    continue
+        return self._scan_sender_fields(self._decompress_blob(blob))[1]
 
-                # Skip if it looks like email (has @) - we want name, not email
-                if b'@' in text_data:
-                    continue
+    def _scan_sender_fields(self, blob: bytes) -> Tuple[str, str]:
+        """
+        Scan decompressed PropertyBlob M markers for sender name and email.
 
-                # Skip if it looks like Message-ID
-                if text_data.startswith(b'<'):
-                    continue
+        Returns:
+            Tuple of (sender_name, sender_email), empty strings if not found
+        """
+        name_found = ""
+        email_found = ""
+
+        # Search for M marker pattern: M + length + name (5-40) or email (10-60)
+        end = len(blob) - 10
+        i = blob.find(b'M', 0, end)
+        while i >= 0:
+            length = blob[i+1]
+            if 5 <= length <= 60 and i + 2 + length <= len(blob):
+                text_data = blob[i+2:i+2+length]
 
-                # Skip folder/system names
-                skip_patterns = [b'Junk', b'Inbox', b'Sent', b'Deleted', b'Drafts',
-                                b'Microsoft', b'Exchange', b'System', b'Recovery',
-                                b'Calendar', b'Contacts', b'Tasks', b'/O=', b'/OU=',
-                                b'CN=', b'Rule', b'http', b'schema']
-                if any(p in text_data for p in skip_patterns):
-                    continue
+                if not name_found and length <= 40:
+                    name_found = self._check_sender_name(text_data, length)
 
-                # Check if mostly ASCII letters and spaces
-                printable = sum(1 for b in text_data if (65 <= b <= 90) or (97 <= b <= 122) or b == 32)
-                if printable >= length * 0.7:
-                    try:
-                        name = text_data.decode('ascii', errors='ignore').strip()
-                        # Must have at least one space (First Last name pattern) or be a single word
-                        if name and (len(name) >= 3):
-                            # Validate it looks like a name
-                            if all(c.isalpha() or c.isspace() for c in name):
-                                return name
-                    except:
-                        pass
+                if not email_found and length >= 10:
+                    email_found = self._check_sender_email(text_data)
 
-        return ""
+                if name_found and email_found:
+                    break
 
-    def _extract_sender_email(self, blob: bytes) -> str:
-        """
-        Extract sender email from PropertyBlob using M marker pattern.
+            i = blob.find(b'M', i + 1, end)
 
-        Looks for M + length + email@domain pattern.
-        """
-        if not blob or len(blob) < 50:
+        return name_found, email_found
+
+    def _check_sender_name(self, text_data: bytes, length: int) -> str:
+        """Return the sender name if M marker content looks like a name."""
+        # Skip if it looks like email (has @) - we want name, not email
+        if b'@' in text_data:
             return ""
 
-        # Try to decompress blob first
-        try:
-            from dissect.esedb.compression import decompress as dissect_decompress
-            blob = dissect_decompress(blob)
-        except:
-            pass
+        # Skip if it looks like Message-ID
+        if text_data.startswith(b'<'):
+            return ""
 
-        # Search for M marker pattern with email content
-        for i in range(len(blob) - 10):
-            if blob[i] == ord('M') and 10 <= blob[i+1] <= 60:
-                length = blob[i+1]
-                if i + 2 + length > len(blob):
-                    continue
+        # Skip folder/system names
+        if _SENDER_SKIP_RE.search(text_data):
+            return ""
 
-                text_data = blob[i+2:i+2+length]
+        # Check if mostly ASCII letters and spaces
+        printable = len(text_data.translate(None, _NON_NAME_LETTER_BYTES))
+        if printable >= length * 0.7:
+            try:
+                name = text_data.decode('ascii', errors='ignore').strip()
+                # Must have at least one space (First Last name pattern) or be a single word
+                if name and (len(name) >= 3):
+                    # Validate it looks like a name
+                    if not name.encode('ascii').translate(None, _ASCII_NAME_CHARS):
+                        return name
+            except:
+                pass
 
-                # Check if this looks like an email (has @)
-                if b'@' not in text_data:
-                    continue
+        return ""
 
-                # Skip Message-ID
-                if text_data.startswith(b'<'):
-                    continue
+    def _check_sender_email(self, text_data: bytes) -> str:
+        """Return the sender email if M marker content looks like an address."""
+        # Check if this looks like an email (has @)
+        if b'@' not in text_data:
+            return ""
 
-                try:
-                    email = text_data.decode('ascii', errors='ignore').strip()
-                    # Validate email format
-                    if '@' in email and '.' in email.split('@')[1]:
-                        # Clean up any trailing garbage
-                        if email.endswith('audit'):
-                            email = email[:-5]
-                        return email
-                except:
-                    pass
+        # Skip Message-ID
+        if text_data.startswith(b'<'):
+            return ""
+
+        try:
+            email = text_data.decode('ascii', errors='ignore').strip()
+            # Validate email format
+            if '@' in email and '.' in email.split('@')[1]:
+                # Clean up any trailing garbage
+                if email.endswith('audit'):
+                    email = email[:-5]
+                return email
+        except:
+            pass
 
         return ""
 
@@ -498,6 +635,12 @@ class EmailExtractor:
         if not display_to or len(display_to) < 4:
             return []
 
+        return list(self._parse_display_to(bytes(display_to)))
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_display_to(display_to: bytes) -> Tuple[str, ...]:
+        """Decode and split a DisplayTo value (memoized, values repeat across messages)."""
         text = ""
 
         # Try to decompress
@@ -517,21 +660,21 @@ class EmailExtractor:
                 pass
 
         if not text:
-            return []
+            return ()
 
         # Split by common delimiters (semicolons, newlines)
-        import re
-        raw_parts = re.split(r'[;\n\r]+', text)
+        raw_parts = _RECIPIENT_SPLIT_RE.split(text)
 
         recipients = []
         for raw in raw_parts:
-            name = self._clean_recipient_name(raw.strip())
+            name = EmailExtractor._clean_recipient_name(raw.strip())
             if name:
                 recipients.append(name)
 
-        return recipients
+        return tuple(recipients)
 
-    def _clean_recipient_name(self, text: str) -> str:
+    @staticmethod
+    def _clean_recipient_name(text: str) -> str:
         """Clean a single recipient name from DisplayTo data."""
         if not text:
             return ""
@@ -674,9 +817,8 @@ class EmailExtractor:
         if not header_value:
             return "", ""
 
-        import re
         # Match "Name <email>" pattern
-        match = re.match(r'^([^<]+)\s*<([^>]+)>', header_value)
+        match = _NAME_ADDR_RE.match(header_value)
         if match:
             return match.group(1).strip(), match.group(2).strip()
 
@@ -688,7 +830,8 @@ class EmailExtractor:
 
         return header_value.strip(), ""
 
-    def _extract_subject(self, blob: bytes, sender_name: str = "") -> str:
+    def _extract_subject(self, blob: bytes, sender_name: str = "",
+                         decompressed: bytes = None) -> str:
         """
         Extract subject from PropertyBlob using <SENDER_NAME_UPPERCASE>M/I pattern.
 
@@ -698,6 +841,7 @@ class EmailExtractor:
         - I + length + UTF-16-LE subject
 
         The name may be truncated, so we try progressively shorter prefixes.
+        Pass ``decompressed`` to reuse an already decompressed blob.
         """
         if not blob or len(blob) < 50:
             return ""
@@ -705,14 +849,9 @@ class EmailExtractor:
         if not sender_name or len(sender_name) < 2:
             return ""
 
-        import re
-
         # Decompress blob
-        try:
-            from dissect.esedb.compression import decompress as dissect_decompress
-            decompressed = dissect_decompress(blob)
-        except:
-            decompressed = blob
+        if decompressed is None:
+            decompressed = self._decompress_blob(blob)
 
         sender_upper = sender_name.upper().encode('ascii', errors='ignore')
         sender_lower = sender_name.lower()
@@ -760,10 +899,7 @@ class EmailExtractor:
                     lower = text.lower()
 
                     # Skip system paths
-                    if any(w in lower for w in ['fydib', 'recipients', 'cn=',
-                                                 '/o=', '/ou=', 'nistrative',
-                                                 'administrative', 'indexing',
-                                                 'bigfunnel']):
+                    if _SUBJECT_SKIP_RE.search(lower):
                         search_from = pos + 1
                         continue
 
@@ -778,7 +914,7 @@ class EmailExtractor:
                         continue
 
                     # Skip CN identifiers (hex-dash-name)
-                    if re.match(r'^[0-9a-f]{20,}-', lower):
+                    if _CN_IDENTIFIER_RE.match(lower):
                         search_from = pos + 1
                         continue
 
@@ -801,7 +937,7 @@ class EmailExtractor:
             return ""
 
         # Remove null bytes and extract printable chars
-        cleaned = bytes(b for b in data if b != 0 and 32 <= b < 127)
+        cleaned = data.translate(None, _NONPRINTABLE_ASCII)
         if cleaned:
             return cleaned.decode('ascii', errors='ignore')
         return ""
@@ -914,21 +1050,14 @@ class EmailExtractor:
     def _extract_message_id(self, blob: bytes) -> str:
         """Extract Message-ID from PropertyBlob."""
         # Look for <...@...> pattern
-        for i in range(len(blob) - 20):
-            if blob[i] == 0x3c:  # '<'
-                # Find closing '>'
-                for j in range(i+1, min(i+100, len(blob))):
-                    if blob[j] == 0x3e:  # '>'
-                        potential = blob[i:j+1]
-                        # Clean up nulls
-                        cleaned = bytes(b for b in potential if b != 0)
-                        try:
-                            msg_id = cleaned.decode('ascii')
-                            if '@' in msg_id and msg_id.startswith('<') and msg_id.endswith('>'):
-                                return msg_id
-                        except:
-                            pass
-                        break
+        limit = len(blob) - 20
+        for match in _MESSAGE_ID_RE.finditer(blob):
+            if match.start() >= limit:
+                break
+            candidate = match.group(1)
+            if b'@' in candidate:
+                # Clean up nulls
+                return candidate.replace(b'\x00', b'').decode('ascii')
         return ""
 
     def extract_message(self, record, col_map: dict, rec_idx: int,
@@ -975,11 +1104,14 @@ class EmailExtractor:
         if msg_class:
             msg.message_class = msg_class
 
-        # Extract sender/email from PropertyBlob first
+        # Extract sender/email from PropertyBlob first (decompressed once)
+        decompressed_blob = None
         if prop_blob:
-            msg.sender_name = self._extract_sender(prop_blob)
-            msg.sender_email = self._extract_sender_email(prop_blob)
-            msg.message_id = self._extract_message_id(prop_blob)
+            (msg.sender_name, msg.sender_email, msg.message_id,
+             decompressed_blob) = self.extract_blob_fields(prop_blob)
+            # Kept only for contacts, whose fields are scraped from the blob text later
+            if msg.message_class.upper().startswith('IPM.CONTACT'):
+                msg._decompressed_property_blob = decompressed_blob
 
         # Extract recipient name→email mapping from RecipientList column
         recip_email_map = self._extract_recipient_emails_from_list(
@@ -994,8 +1126,7 @@ class EmailExtractor:
                 msg.to_names = recipient_names
                 # Look up real emails from RecipientList, fall back to placeholder
                 msg.to_emails = [
-                    recip_email_map.get(name.lower(),
-                        f"{name.lower().replace(' ', '')}@unknown")
+                    recip_email_map.get(name.lower()) or _placeholder_email(name)
                     for name in recipient_names
                 ]
 
@@ -1022,7 +1153,7 @@ class EmailExtractor:
 
         # Extract subject using sender name + SubjectPrefix column
         if prop_blob:
-            msg.subject = self._extract_subject(prop_blob, msg.sender_name)
+            msg.subject = self._extract_subject(prop_blob, msg.sender_name, decompressed_blob)
 
         # Try SubjectPrefix column (may have "RE:", "FW:" prefix or full subject)
         subject_prefix = self._get_string(record, col_map.get('SubjectPrefix', -1))
@@ -1038,7 +1169,7 @@ class EmailExtractor:
 
         # Build sender email if missing
         if msg.sender_name and not msg.sender_email:
-            msg.sender_email = f"{msg.sender_name.lower().replace(' ', '')}@unknown"
+            msg.sender_email = _placeholder_email(msg.sender_name)
         elif not msg.sender_email and self.mailbox_email:
             msg.sender_email = self.mailbox_email
 
@@ -1076,16 +1207,8 @@ class EmailExtractor:
             return None
         try:
             val = record.get_value_data(col_idx)
-            if not val:
-                return None
-            if len(val) == 4:
-                return struct.unpack('<I', val)[0]
-            elif len(val) == 8:
-                return struct.unpack('<Q', val)[0]
-            elif len(val) == 2:
-                return struct.unpack('<H', val)[0]
-            elif len(val) == 1:
-                return val[0]
+            if val and len(val) in (1, 2, 4, 8):
+                return int.from_bytes(val, 'little')
         except:
             pass
         return None
@@ -1121,7 +1244,7 @@ class EmailExtractor:
             val = record.get_value_data(col_idx)
             if not val or len(val) != 8:
                 return None
-            filetime = struct.unpack('<Q', val)[0]
+            filetime = int.from_bytes(val, 'little')
             if filetime == 0:
                 return None
             unix_time = (filetime - 116444736000000000) / 10000000
@@ -1166,7 +1289,7 @@ class EmailExtractor:
             # Fallback: try to extract printable content
             header_type = native_body[0]
             content = native_body[7:] if header_type in [0x17, 0x18, 0x19] else native_body
-            printable = bytes(b for b in content if 32 <= b <= 126 or b in [9, 10, 13])
+            printable = content.translate(None, _NONPRINTABLE)
             if printable:
                 text_body = printable.decode('ascii', errors='ignore')
         except:
@@ -1181,9 +1304,10 @@ class EmailExtractor:
             return extract_body_from_property_blob(blob)
         except:
             # Simple fallback: extract printable strings
-            strings = re.findall(rb'[\x20-\x7e]{10,}', blob)
+            # Stop scanning the blob after the first 5 runs
+            strings = [m.group() for m in islice(_PRINTABLE_RUN_RE.finditer(blob), 5)]
             if strings:
-                return '\n'.join(s.decode('ascii', errors='ignore') for s in strings[:5])
+                return '\n'.join(s.decode('ascii', errors='ignore') for s in strings)
         return ""
 
     def _extract_attachments(self, record, col_map: dict, tables: dict,
@@ -1191,37 +1315,22 @@ class EmailExtractor:
         """Extract attachments for the message."""
         attachments = []
 
-        attach_table = tables.get(f"Attachment_{mailbox_num}")
-        if not attach_table:
-            return attachments
-
-        # Get attachment column map
-        attach_col_map = {}
-        for j in range(attach_table.get_number_of_columns()):
-            col = attach_table.get_column(j)
-            if col:
-                attach_col_map[col.name] = j
-
         # Get SubobjectsBlob for attachment linking
         subobjects = self._get_bytes(record, col_map.get('SubobjectsBlob', -1))
         linked_inids = self._parse_subobjects(subobjects) if subobjects else []
 
-        # Build Inid to record map
-        inid_map = {}
-        for i in range(attach_table.get_number_of_records()):
-            try:
-                att_rec = attach_table.get_record(i)
-                if not att_rec:
-                    continue
-                inid = self._get_bytes(att_rec, attach_col_map.get('Inid', -1))
-                if inid and len(inid) >= 4:
-                    inid_val = struct.unpack('<I', inid[:4])[0]
-                    inid_map[inid_val] = i
-            except:
-                pass
+        # No 0x21 Inid markers - skip the attachment table entirely
+        if not linked_inids:
+            return attachments
+
+        attach_table = tables.get(f"Attachment_{mailbox_num}")
+        if not attach_table:
+            return attachments
+
+        attach_col_map, inid_map = self._get_attachment_index(attach_table, mailbox_num)
 
-        # Load linked attachments
-        for inid_val in linked_inids:
+        # Load linked attachments, each distinct Inid once
+        for inid_val in dict.fromkeys(linked_inids):
             if inid_val not in inid_map:
                 continue
 
@@ -1266,6 +1375,45 @@ class EmailExtractor:
 
         return attachments
 
+    def _get_attachment_index(self, attach_table, mailbox_num: int) -> Tuple[dict, dict]:
+        """
+        Get the attachment column map and Inid -> record index map.
+
+        Built with one scan of the Attachment table and cached per mailbox,
+        so exporting a folder does not rescan the table for every message.
+
+        Returns:
+            Tuple of (attach_col_map, inid_map)
+        """
+        cached = self._attachment_index_cache.get(mailbox_num)
+        if cached and cached[0] is attach_table:
+            return cached[1], cached[2]
+
+        # Get attachment column map
+        attach_col_map = {}
+        for j in range(attach_table.get_number_of_columns()):
+            col = attach_table.get_column(j)
+            if col:
+                attach_col_map[col.name] = j
+
+        # Build Inid to record map
+        inid_idx = attach_col_map.get('Inid', -1)
+        inid_map = {}
+        num_records = attach_table.get_number_of_records() if inid_idx >= 0 else 0
+        for i in range(num_records):
+            try:
+                att_rec = attach_table.get_record(i)
+                if not att_rec:
+                    continue
+                inid = att_rec.get_value_data(inid_idx)
+                if inid and len(inid) >= 4:
+                    inid_map[_U32.unpack_from(inid)[0]] = i
+            except:
+                pass
+
+        self._attachment_index_cache[mailbox_num] = (attach_table, attach_col_map, inid_map)
+        return attach_col_map, inid_map
+
     def _parse_subobjects(self, blob: bytes) -> List[int]:
         """Parse SubobjectsBlob to get attachment Inid values.
 
@@ -1286,27 +1434,21 @@ class EmailExtractor:
             pass  # Use raw blob if decompression fails
 
         # Parse using 0x21 pattern: 0x21 followed by Inid byte
-        inids = []
-        i = 0
-        while i < len(data) - 1:
-            if data[i] == 0x21:
-                inids.append(data[i + 1])
-                i += 2
-            else:
-                i += 1
-
-        return inids
+        return list(b''.join(_SUBOBJ_INID_RE.findall(data)))
 
     def _extract_attachment_filename(self, blob: bytes) -> str:
         """Extract filename from attachment PropertyBlob."""
         if not blob:
             return ""
 
-        extensions = [b'.txt', b'.xml', b'.doc', b'.docx', b'.pdf', b'.jpg',
-                      b'.png', b'.xlsx', b'.xls', b'.zip', b'.eml', b'.msg']
+        # First occurrence of each extension, from a single scan
+        first_idx = {}
+        for match in _ATTACHMENT_EXT_RE.finditer(blob):
+            for ext in _ATTACHMENT_EXT_PREFIXES[match.group().lower()]:
+                first_idx.setdefault(ext, match.start())
 
-        for ext in extensions:
-            idx = blob.lower().find(ext)
+        for ext in _ATTACHMENT_EXTENSIONS:
+            idx = first_idx.get(ext, -1)
             if idx >= 0:
                 start = idx
                 while start > 0 and 0x20 <= blob[start - 1] < 0x7f:
@@ -1322,16 +1464,9 @@ class EmailExtractor:
         if not blob:
             return ""
 
-        mime_types = [
-            (b'text/plain', 'text/plain'),
-            (b'text/html', 'text/html'),
-            (b'application/pdf', 'application/pdf'),
-            (b'image/jpeg', 'image/jpeg'),
-            (b'image/png', 'image/png'),
-        ]
-
-        for pattern, mime in mime_types:
-            if pattern in blob:
-                return mime
+        found = set(_ATTACHMENT_MIME_RE.findall(blob))
+        for mime in _ATTACHMENT_MIME_TYPES:
+            if mime in found:
+                return mime.decode('ascii')
 
         return "application/octet-stream"
@@ -9,9 +9,14 @@ import os
 import struct
 import re
 import time
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 
 class Profiler:
@@ -88,9 +93,9 @@ from PyQt6.QtWidgets import (
     QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView,
     QStatusBar, QMessageBox, QProgressBar, QMenu, QListWidget,
     QListWidgetItem, QCheckBox, QTextBrowser, QDialog, QFormLayout,
-    QDateEdit, QDialogButtonBox, QGridLayout, QRadioButton
+    QDateEdit, QDialogButtonBox, QGridLayout, QRadioButton, QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QDate
+from PyQt6.QtCore import Qt, QThread, QEventLoop, pyqtSignal, QUrl, QDate
 from PyQt6.QtGui import QFont, QAction, QTextOption, QColor, QPalette, QIcon
 
 # Using QTextBrowser for lightweight HTML rendering (no WebEngine dependency)
@@ -113,11 +118,14 @@ except ImportError:
 
 # Try to import folder mapping
 try:
-    from core.folder_mapping import get_folder_name as get_mapped_folder_name, SPECIAL_FOLDER_MAP
+    from core.folder_mapping import get_folder_name, SPECIAL_FOLDER_MAP, FOLDER_NUM_TO_NAME
+    # Pure lookup on (folder_id, special_num); folders repeat across mailbox reloads
+    get_mapped_folder_name = lru_cache(maxsize=1024)(get_folder_name)
     HAS_FOLDER_MAPPING = True
 except ImportError:
     HAS_FOLDER_MAPPING = False
     SPECIAL_FOLDER_MAP = {}
+    FOLDER_NUM_TO_NAME = {}
 
 # Import stable email extraction module
 try:
@@ -156,24 +164,67 @@ EXTENDED_ENCODINGS = [
     'cp866',         # DOS Cyrillic
 ]
 
+# Printable ASCII runs and Exchange legacy DN (used by message detail views)
+_ASCII_STRINGS_10 = re.compile(rb'[\x20-\x7e]{10,}')
+# Maps every non-printable byte to NUL so printable runs can be split out
+_ASCII_RUN_TABLE = bytes(b if 0x20 <= b <= 0x7e else 0 for b in range(256))
+_EXCHANGE_DN_RE = re.compile(rb'/O=[A-Z0-9]+/OU=[^/\x00]+(?:/CN=[^/\x00]+)*', re.IGNORECASE)
+
+# SubobjectsBlob Inid references: 0x21 + Inid pairs, or 0x84 + (Inid + 20) for Inid 1..100
+_SUBOBJ_INID_RE = re.compile(rb'\x21(.)', re.DOTALL)
+_SUBOBJ_ENCODED_INID_RE = re.compile(rb'\x84(?=([\x15-\x78]))')
+
+# Contact fields scraped from PropertyBlob text and HTML bodies
+_CONTACT_EMAIL_RE = re.compile(r'[\w.-]+@[\w.-]+\.\w{2,}')
+_CONTACT_PHONE_RE = re.compile(r'[\+]?[\d\s\-\(\)]{7,15}')
+_CONTACT_COMPANY_RE = re.compile(r'(?:company|organization|org)[:\s]*([^<\n]{2,50})', re.IGNORECASE)
+_CONTACT_TITLE_RE = re.compile(r'(?:title|position|job)[:\s]*([^<\n]{2,50})', re.IGNORECASE)
+
+# Bytes that are NOT printable text (printable ASCII plus tab/LF/CR), for bytes.translate
+_NONPRINTABLE = bytes(b for b in range(256) if not (32 <= b <= 126 or b in (9, 10, 13)))
+# Bytes outside printable ASCII (0x20-0x7e), for bytes.translate
+_NONPRINTABLE_ASCII = bytes(b for b in range(256) if not 32 <= b <= 126)
+# Control bytes other than tab/LF/CR, deleted via bytes.translate to count them
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 13))
+
+# Characters not allowed in Windows file names, mapped to '_' via str.translate
+_FILENAME_UNSAFE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Printable ASCII (0x20-0x7e), deleted via bytes.translate to find other bytes
+_PRINTABLE_ASCII = bytes(range(0x20, 0x7f))
+
+# Hex dump ASCII column: printable ASCII kept, everything else shown as '.'
+_HEXDUMP_ASCII = bytes(b if 32 <= b < 127 else 0x2e for b in range(256))
+
+# Attachment filename extensions in lookup priority order, searched in one pass.
+# Longest alternatives first; a '.docx' hit also counts as a '.doc' occurrence.
+_ATTACHMENT_EXTENSIONS = (b'.txt', b'.xml', b'.doc', b'.docx', b'.pdf', b'.jpg',
+                          b'.png', b'.xlsx', b'.xls', b'.zip', b'.eml', b'.msg',
+                          b'.html', b'.htm', b'.csv')
+_ATTACHMENT_EXT_RE = re.compile(
+    b'|'.join(re.escape(ext) for ext in sorted(_ATTACHMENT_EXTENSIONS, key=len, reverse=True)),
+    re.IGNORECASE)
+_ATTACHMENT_EXT_PREFIXES = {ext: tuple(e for e in _ATTACHMENT_EXTENSIONS if ext.startswith(e))
+                            for ext in _ATTACHMENT_EXTENSIONS}
+
+# Attachment MIME types in lookup priority order, searched in one pass
+_ATTACHMENT_MIME_TYPES = (b'text/plain', b'text/html', b'text/xml', b'application/pdf',
+                          b'application/xml', b'image/jpeg', b'image/png')
+_ATTACHMENT_MIME_RE = re.compile(b'|'.join(map(re.escape, _ATTACHMENT_MIME_TYPES)))
+
+# Precompiled little-endian integer formats
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+
 
 def try_decode(data, encodings=None):
     """Try to decode bytes using multiple encodings with smart detection."""
     if not data:
         return None
 
-    # Check if data is pure ASCII (all bytes < 128)
-    has_high_bytes = any(b >= 128 for b in data)
-
-    if not has_high_bytes:
-        # Pure ASCII - decode as ASCII or UTF-8
-        try:
-            return data.decode('ascii').rstrip('\x00')
-        except UnicodeDecodeError:
-            try:
-                return data.decode('utf-8').rstrip('\x00')
-            except UnicodeDecodeError:
-                pass
+    # Pure ASCII (all bytes < 128) always decodes as ASCII, nothing to try
+    if data.isascii():
+        return data.decode('ascii').rstrip('\x00')
 
     # Has high bytes - try UTF-8 first (handles multi-byte UTF-8)
     try:
@@ -183,20 +234,19 @@ def try_decode(data, encodings=None):
     except UnicodeDecodeError:
         pass
 
-    # Try extended encodings (Cyrillic, etc.) only if there are high bytes
-    if has_high_bytes:
-        if encodings is None:
-            encodings = EXTENDED_ENCODINGS
+    # Try extended encodings (Cyrillic, etc.)
+    if encodings is None:
+        encodings = EXTENDED_ENCODINGS
 
-        for encoding in encodings:
-            try:
-                text = data.decode(encoding)
-                # Check if result is mostly printable
-                printable_count = sum(1 for c in text if c.isprintable() or c.isspace())
-                if printable_count >= len(text) * 0.8:
-                    return text.rstrip('\x00')
-            except (UnicodeDecodeError, LookupError):
-                continue
+    for encoding in encodings:
+        try:
+            text = data.decode(encoding)
+            # Check if result is mostly printable
+            printable_count = sum(1 for c in text if c.isprintable() or c.isspace())
+            if printable_count >= len(text) * 0.8:
+                return text.rstrip('\x00')
+        except (UnicodeDecodeError, LookupError):
+            continue
 
     # Final fallback - decode with replacement
     try:
@@ -221,14 +271,9 @@ def get_int_value(record, col_idx):
         return None
     try:
         val = record.get_value_data(col_idx)
-        if not val:
-            return None
-        if len(val) == 4:
-            return struct.unpack('<I', val)[0]
-        elif len(val) == 8:
-            return struct.unpack('<Q', val)[0]
-        elif len(val) == 2:
-            return struct.unpack('<H', val)[0]
+        # Only whole 16/32/64-bit columns are integers; other widths are blobs
+        if val and len(val) in (2, 4, 8):
+            return int.from_bytes(val, 'little')
     except:
         pass
     return None
@@ -255,12 +300,14 @@ def extract_attachment_filename(blob):
     if not blob:
         return ""
 
-    extensions = [b'.txt', b'.xml', b'.doc', b'.docx', b'.pdf', b'.jpg',
-                  b'.png', b'.xlsx', b'.xls', b'.zip', b'.eml', b'.msg',
-                  b'.html', b'.htm', b'.csv']
+    # First occurrence of each extension, from a single scan
+    first_idx = {}
+    for match in _ATTACHMENT_EXT_RE.finditer(blob):
+        for ext in _ATTACHMENT_EXT_PREFIXES[match.group().lower()]:
+            first_idx.setdefault(ext, match.start())
 
-    for ext in extensions:
-        idx = blob.lower().find(ext)
+    for ext in _ATTACHMENT_EXTENSIONS:
+        idx = first_idx.get(ext, -1)
         if idx >= 0:
             start = idx
             while start > 0 and 0x20 <= blob[start - 1] < 0x7f:
@@ -276,19 +323,10 @@ def extract_attachment_content_type(blob):
     if not blob:
         return "application/octet-stream"
 
-    mime_patterns = [
-        (b'text/plain', 'text/plain'),
-        (b'text/html', 'text/html'),
-        (b'text/xml', 'text/xml'),
-        (b'application/pdf', 'application/pdf'),
-        (b'application/xml', 'application/xml'),
-        (b'image/jpeg', 'image/jpeg'),
-        (b'image/png', 'image/png'),
-    ]
-
-    for pattern, mime in mime_patterns:
-        if pattern in blob:
-            return mime
+    found = set(_ATTACHMENT_MIME_RE.findall(blob))
+    for mime in _ATTACHMENT_MIME_TYPES:
+        if mime in found:
+            return mime.decode('ascii')
 
     return "application/octet-stream"
 
@@ -299,23 +337,21 @@ def is_encrypted_or_binary(data):
     if not data or len(data) < 2:
         return False
 
-    # Count control characters and high-bit bytes
-    control_count = sum(1 for b in data if b < 32 and b not in (9, 10, 13))
-    high_byte_count = sum(1 for b in data if b >= 128)
-    printable_count = sum(1 for b in data if 32 <= b < 127)
-
     total = len(data)
 
+    # Count control characters; translate/isascii do the byte scans in C
+    control_count = total - len(data.translate(None, _CONTROL_BYTES))
+
     # If more than 30% control chars or mixed high-bytes with control chars, likely encrypted
     if control_count > total * 0.3:
         return True
 
     # If has control chars at start (like 0x12) and high bytes, likely encrypted
-    if data[0] < 32 and high_byte_count > 0:
+    if data[0] < 32 and not data.isascii():
         return True
 
     # If less than 50% printable ASCII and not valid UTF-16, likely encrypted
-    if printable_count < total * 0.5:
+    if len(data.translate(None, _NONPRINTABLE_ASCII)) < total * 0.5:
         # Check if it could be UTF-16
         has_null_pattern = len(data) >= 4 and data[1] == 0 and data[3] == 0
         if not has_null_pattern:
@@ -350,7 +386,8 @@ def get_string_value(record, col_idx):
         if is_likely_utf16:
             try:
                 text = val.decode('utf-16-le').rstrip('\x00')
-                if text and all(c.isprintable() or c.isspace() for c in text):
+                # isprintable() settles the common case in C; dropping whitespace via split() admits it
+                if text and (text.isprintable() or ''.join(text.split()).isprintable()):
                     return text
             except:
                 pass
@@ -373,6 +410,12 @@ def get_bytes_value(record, col_idx):
         return None
 
 
+def get_bool_value(record, col_idx):
+    """Get a bit/boolean column as bool (missing, empty or all-zero is False)."""
+    val = get_bytes_value(record, col_idx)
+    return bool(val) and any(val)
+
+
 def get_filetime_value(record, col_idx):
     """Get datetime from Windows FILETIME."""
     if col_idx < 0:
@@ -381,7 +424,7 @@ def get_filetime_value(record, col_idx):
         val = record.get_value_data(col_idx)
         if not val or len(val) != 8:
             return None
-        filetime = struct.unpack('<Q', val)[0]
+        filetime = int.from_bytes(val, 'little')
         if filetime == 0:
             return None
         unix_time = (filetime - 116444736000000000) / 10000000
@@ -390,6 +433,130 @@ def get_filetime_value(record, col_idx):
         return None
 
 
+# Bulk EML export: serialization and disk writes run on a small thread pool
+EXPORT_WRITE_WORKERS = 4
+EXPORT_WRITE_BACKLOG = 64  # Max queued writes before the export loop waits
+EXPORT_PROGRESS_STEP = 64  # Items between progress bar updates
+
+# Hex dump views: bytes dumped before the rest is summarized (text layout cost grows with length)
+HEXDUMP_MAX_BYTES = 64 * 1024
+
+
+def write_bytes_file(out_path, data, flags=os.O_WRONLY | os.O_CREAT | os.O_TRUNC):
+    """Write bytes to a file with raw os.write calls (no Python file buffering)."""
+    fd = os.open(out_path, flags | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+_eml_buffers = threading.local()  # One reusable serialization buffer per pool thread
+
+
+def write_eml_file(out_path, email_msg):
+    """Serialize an EmailMessage to EML and write it (runs on the export pool)."""
+    buf = getattr(_eml_buffers, 'buf', None)
+    if buf is None:
+        buf = _eml_buffers.buf = bytearray(1 << 16)
+    size = email_msg.to_eml_into(buf)
+    write_bytes_file(out_path, memoryview(buf)[:size])
+
+
+def finish_eml_writes(eml_writes, status, keep=0):
+    """Wait for queued EML writes until at most `keep` remain; return the failure count."""
+    failed = 0
+    while len(eml_writes) > keep:
+        rec_idx, future = eml_writes.popleft()
+        try:
+            future.result()
+        except Exception as e:
+            failed += 1
+            status(f"Error exporting record {rec_idx}: {e}")
+    return failed
+
+
+@dataclass(slots=True)
+class MailboxInfo:
+    """A Message_<n> table found when the database is opened."""
+    number: int
+    message_count: int
+    owner_email: str = None  # Resolved after all tables are listed
+
+
+@dataclass(slots=True)
+class AttachmentRef:
+    """Attachment metadata for the current message; the data is read on demand."""
+    filename: str
+    content_type: str
+    size: int
+    record_idx: int
+    is_external: bool = False
+
+
+class MessageListCache:
+    """Loaded folder messages stored as parallel per-column lists."""
+
+    __slots__ = ('rec_idx', 'date', 'sender', 'recipient', 'from_email', 'to_email',
+                 'subject', 'search_text', 'is_read', 'has_attach', 'is_hidden',
+                 'has_error', 'filter_index', 'visible_index')
+
+    def __init__(self):
+        self.rec_idx = []
+        self.date = []
+        self.sender = []       # From column (email, fallback to name)
+        self.recipient = []    # To column (email, fallback to name)
+        self.from_email = []
+        self.to_email = []
+        self.subject = []
+        self.search_text = []  # Lowercased text matched by the search box
+        self.is_read = bytearray()
+        self.has_attach = bytearray()
+        self.is_hidden = bytearray()
+        self.has_error = bytearray()
+        # Read filter index (1=Unread, 2=Read, 3=Failed) -> row numbers
+        self.filter_index = {1: [], 2: [], 3: []}
+        # Same read filters (plus 0 = all) restricted to rows that are not hidden
+        self.visible_index = {0: [], 1: [], 2: [], 3: []}
+
+    def __len__(self):
+        return len(self.rec_idx)
+
+    def append(self, rec_idx, date, sender, recipient, from_email, to_email,
+               subject, is_read, has_attach, is_hidden, has_error):
+        row = len(self.rec_idx)
+        self.rec_idx.append(rec_idx)
+        self.date.append(date)
+        self.sender.append(sender)
+        self.recipient.append(recipient)
+        self.from_email.append(from_email)
+        self.to_email.append(to_email)
+        self.subject.append(subject)
+        self.search_text.append(f"{subject} {sender} {recipient} {from_email} {to_email}".lower())
+        self.is_read.append(bool(is_read))
+        self.has_attach.append(bool(has_attach))
+        self.is_hidden.append(bool(is_hidden))
+        self.has_error.append(bool(has_error))
+        self.filter_index[2 if is_read else 1].append(row)
+        if has_error:
+            self.filter_index[3].append(row)
+        if not is_hidden:
+            visible = self.visible_index
+            visible[0].append(row)
+            visible[2 if is_read else 1].append(row)
+            if has_error:
+                visible[3].append(row)
+
+    def rows(self, read_filter=0, include_hidden=True):
+        """Return the row numbers matching a read filter (0 = all rows)."""
+        if not include_hidden:
+            return self.visible_index.get(read_filter, self.visible_index[0])
+        return self.filter_index.get(read_filter, range(len(self.rec_idx)))
+
+
 class LoadWorker(QThread):
     """Background worker for loading database."""
     progress = pyqtSignal(str)
@@ -426,22 +593,20 @@ class LoadWorker(QThread):
                     if table.name.startswith("Message_"):
                         try:
                             num = int(table.name.split('_')[1])
-                            result['mailboxes'].append({
-                                'number': num,
-                                'message_count': table.get_number_of_records(),
-                                'owner_email': None  # Will be populated later
-                            })
+                            result['mailboxes'].append(
+                                MailboxInfo(num, table.get_number_of_records()))
                         except:
                             pass
 
             # Sort mailboxes
-            result['mailboxes'].sort(key=lambda x: x['number'])
+            result['mailboxes'].sort(key=lambda x: x.number)
             result['file_size'] = os.path.getsize(self.edb_path)
-            result['total_messages'] = sum(mb['message_count'] for mb in result['mailboxes'])
+            result['total_messages'] = sum(mb.message_count for mb in result['mailboxes'])
 
-            # Try to extract mailbox owner email from Sent Items
+            # Mailbox owners, resolved for all mailboxes in one Mailbox table pass
+            owners = self._get_mailbox_owners(result['tables'], {mb.number for mb in result['mailboxes']})
             for mb in result['mailboxes']:
-                mb['owner_email'] = self._get_mailbox_owner(result['tables'], mb['number'])
+                mb.owner_email = owners.get(mb.number)
 
             profiler.stop("DB Open")
             self.finished.emit(result)
@@ -450,13 +615,15 @@ class LoadWorker(QThread):
             profiler.stop("DB Open")
             self.error.emit(str(e))
 
-    def _get_mailbox_owner(self, tables, mailbox_num):
-        """Get mailbox owner from Mailbox table."""
-        profiler.start("Get Mailbox Owner")
+    def _get_mailbox_owners(self, tables, mailbox_nums):
+        """Get owners for the given mailbox numbers from one pass over the Mailbox table."""
+        profiler.start("Get Mailbox Owners")
+        owners = {}  # mailbox number -> owner display name
         try:
             mailbox_table = tables.get('Mailbox')
             if not mailbox_table:
-                return None
+                profiler.stop("Get Mailbox Owners")
+                return owners
 
             col_map = get_column_map(mailbox_table)
             mb_num_idx = col_map.get('MailboxNumber', -1)
@@ -469,15 +636,18 @@ class LoadWorker(QThread):
                     if not record:
                         continue
 
-                    # Check if this is the requested mailbox
+                    # Mailboxes this record can name (records without a number match any)
                     mb_num_data = record.get_value_data(mb_num_idx)
                     if mb_num_data:
-                        import struct
-                        mb_num = struct.unpack('<I', mb_num_data)[0]
-                        if mb_num != mailbox_num:
+                        mb_num = _U32.unpack(mb_num_data)[0]
+                        if mb_num not in mailbox_nums or mb_num in owners:
                             continue
+                        targets = (mb_num,)
+                    else:
+                        targets = [num for num in mailbox_nums if num not in owners]
 
                     # Try to get owner name
+                    owner = None
                     for col_idx in [owner_name_idx, display_name_idx]:
                         if col_idx < 0:
                             continue
@@ -487,22 +657,56 @@ class LoadWorker(QThread):
                                 decompressed = dissect_decompress(val)
                                 for enc in ['utf-16-le', 'utf-8']:
                                     try:
-                                        text = decompressed.decode(enc).rstrip('\x00')
-                                        if text:
-                                            profiler.stop("Get Mailbox Owner")
-                                            return text
+                                        owner = decompressed.decode(enc).rstrip('\x00')
+                                        if owner:
+                                            break
                                     except:
                                         pass
                             except:
                                 pass
+                        if owner:
+                            break
+
+                    if owner:
+                        for num in targets:
+                            owners[num] = owner
+                        # Every mailbox has its owner: the remaining records cannot change it
+                        if len(owners) == len(mailbox_nums):
+                            break
                 except:
                     pass
-
-            profiler.stop("Get Mailbox Owner")
-            return None
         except:
-            profiler.stop("Get Mailbox Owner")
-            return None
+            pass
+
+        profiler.stop("Get Mailbox Owners")
+        return owners
+
+
+class ExportWorker(QThread):
+    """Background worker for export loops; reports progress through signals."""
+    progress = pyqtSignal(int)
+    status = pyqtSignal(str)
+
+    def __init__(self, export_func, total=0):
+        super().__init__()
+        self.export_func = export_func
+        self.total = total
+        self.result = None
+        self.error = None
+
+    def run(self):
+        total = self.total
+        emit = self.progress.emit
+
+        def report(n):
+            # One queued signal per item floods the GUI event loop; emit in steps
+            if n % EXPORT_PROGRESS_STEP == 0 or n == total:
+                emit(n)
+
+        try:
+            self.result = self.export_func(report, self.status.emit)
+        except Exception as e:
+            self.error = e
 
 
 class ProfilerDialog(QDialog):
@@ -579,6 +783,26 @@ class ProfilerDialog(QDialog):
         self.refresh()
 
 
+class MessageItemDelegate(QStyledItemDelegate):
+    """Colors message list rows from a state value stored on column 0."""
+
+    STATE_ROLE = Qt.ItemDataRole.UserRole.value + 1
+    STATE_ERROR = 1
+    STATE_HIDDEN = 2
+
+    # Failed messages red, hidden messages gray
+    STATE_COLORS = {
+        STATE_ERROR: QColor(255, 85, 85),
+        STATE_HIDDEN: QColor(128, 128, 128),
+    }
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        state = index.siblingAtColumn(0).data(self.STATE_ROLE)
+        if state:
+            option.palette.setColor(QPalette.ColorRole.Text, self.STATE_COLORS[state])
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -590,19 +814,23 @@ class MainWindow(QMainWindow):
         self.resize(1400, 700)  # Default size, can be resized smaller
 
         self.db = None
+        self._export_worker = None  # ExportWorker reading from self.db, while one runs
         self.tables = {}
         self.current_mailbox = None
+        self.mailbox_owners = {}  # mailbox number -> owner name read by LoadWorker
         self.folders = {}
+        self._folder_path_cache = {}  # folder_id -> "Parent/Child" export path
         self.messages_by_folder = defaultdict(list)
+        self.hidden_records = set()  # Message record indices flagged IsHidden
         self.current_record_idx = None
-        self.current_attachments = []  # List of (filename, content_type, data)
+        self.current_attachments = []  # List of AttachmentRef
         self.current_email_message = None  # EmailMessage object for export
         self.current_msg_type = 'email'  # 'email', 'calendar', or 'contact'
         self.current_cal_event = None
         self.current_contact = None
         self.email_extractor = None  # EmailExtractor instance
         self.calendar_extractor = None  # CalendarExtractor instance
-        self.folder_messages_cache = {}  # Cache: folder_id -> list of message data
+        self.folder_messages_cache = {}  # Cache: folder_id -> MessageListCache
         self._cached_msg_col_map = None
         self._cached_msg_columns = None
         self._cached_attach_col_map = None
@@ -611,6 +839,16 @@ class MainWindow(QMainWindow):
         self.debug_mode = False
         self.profiler_dialog = None
 
+        # Shared styling for unread message rows (built once, reused per item)
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+        # Content tabs rendered only when shown: widget -> (render, args)
+        self._deferred_views = {}
+        self._columns_table_columns = None  # Column list whose names fill the All Columns tab
+        self._html_data = None     # Current message HTML (bytes or fallback text)
+        self._html_source = None   # Decoded HTML, filled on first use
+
         self._setup_ui()
         self._setup_menu()
 
@@ -831,6 +1069,7 @@ class MainWindow(QMainWindow):
         self.message_list.itemSelectionChanged.connect(self._on_message_selected)
         self.message_list.setMinimumWidth(500)
         self.message_list.setSortingEnabled(True)
+        self.message_list.setItemDelegate(MessageItemDelegate(self.message_list))
         # Set column widths
         self.message_list.setColumnWidth(0, 45)   # #
         self.message_list.setColumnWidth(1, 115)  # Date
@@ -847,7 +1086,7 @@ class MainWindow(QMainWindow):
         middle_layout.addWidget(self.message_list)
 
         # Store all messages for filtering
-        self.all_messages_cache = []
+        self.all_messages_cache = MessageListCache()
 
         main_splitter.addWidget(middle_panel)
 
@@ -990,8 +1229,8 @@ class MainWindow(QMainWindow):
         self.content_tabs.addTab(self.html_source_view, "HTML Source")
 
         # Raw Body tab with compressed/uncompressed toggle
-        raw_body_widget = QWidget()
-        raw_body_layout = QVBoxLayout(raw_body_widget)
+        self.raw_body_widget = QWidget()
+        raw_body_layout = QVBoxLayout(self.raw_body_widget)
         raw_body_layout.setContentsMargins(0, 0, 0, 0)
 
         # Toggle for compressed/uncompressed view
@@ -1007,11 +1246,12 @@ class MainWindow(QMainWindow):
         self.raw_body_view.setReadOnly(True)
         self.raw_body_view.setFont(QFont("Consolas", 9))
         raw_body_layout.addWidget(self.raw_body_view)
-        self.content_tabs.addTab(raw_body_widget, "Raw Body")
+        self.content_tabs.addTab(self.raw_body_widget, "Raw Body")
 
         # Store raw data for toggle
         self.current_raw_body_compressed = None
         self.current_raw_body_decompressed = None
+        self._raw_body_rendered = None  # (show_compressed, compressed, decompressed) last shown
 
         # Parsed tab
         self.parsed_view = QTextEdit()
@@ -1038,6 +1278,7 @@ class MainWindow(QMainWindow):
         self.columns_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.content_tabs.addTab(self.columns_table, "All Columns")
 
+        self.content_tabs.currentChanged.connect(self._on_content_tab_changed)
         right_layout.addWidget(self.content_tabs)
 
         main_splitter.addWidget(right_panel)
@@ -1095,18 +1336,19 @@ class MainWindow(QMainWindow):
 
         # Clear folder cache when loading new database
         self.folder_messages_cache.clear()
+        self.mailbox_owners = {mb.number: mb.owner_email for mb in result['mailboxes'] if mb.owner_email}
 
         # Populate mailbox combo without auto-selecting
         self.mailbox_combo.blockSignals(True)
         self.mailbox_combo.clear()
         self.mailbox_combo.addItem("-- Select Mailbox --", None)
         for mb in result['mailboxes']:
-            owner = mb.get('owner_email', '')
+            owner = mb.owner_email
             if owner:
-                label = f"{owner} ({mb['message_count']} msgs)"
+                label = f"{owner} ({mb.message_count} msgs)"
             else:
-                label = f"Mailbox {mb['number']} ({mb['message_count']} msgs)"
-            self.mailbox_combo.addItem(label, mb['number'])
+                label = f"Mailbox {mb.number} ({mb.message_count} msgs)"
+            self.mailbox_combo.addItem(label, mb.number)
         self.mailbox_combo.setCurrentIndex(0)
         self.mailbox_combo.blockSignals(False)
 
@@ -1150,9 +1392,9 @@ class MainWindow(QMainWindow):
         self._cached_msgdocid_to_attach = None
 
         try:
-            self._load_folders()
-            self._index_messages()
+            # Column maps first so the folder scan can reuse them
             self._build_mailbox_caches()
+            self._load_folders()
             self.export_mailbox_btn.setEnabled(True)
         except Exception as e:
             self.status.showMessage(f"Error loading mailbox: {e}")
@@ -1183,22 +1425,21 @@ class MainWindow(QMainWindow):
             attach_col_map = get_column_map(attach_table)
             self._cached_attach_col_map = attach_col_map
 
+            inid_idx = attach_col_map.get('Inid', -1)
+            msgdocid_idx = attach_col_map.get('MessageDocumentId', -1)
             inid_to_record = {}
-            msgdocid_to_attach = {}
+            msgdocid_to_attach = defaultdict(list)
             for i in range(attach_table.get_number_of_records()):
                 try:
                     att_record = attach_table.get_record(i)
                     if not att_record:
                         continue
-                    inid = get_bytes_value(att_record, attach_col_map.get('Inid', -1))
+                    inid = get_bytes_value(att_record, inid_idx)
                     if inid and len(inid) >= 4:
-                        inid_val = struct.unpack('<I', inid[:4])[0]
-                        inid_to_record[inid_val] = i
+                        inid_to_record[_U32.unpack_from(inid)[0]] = i
                     # Also index by MessageDocumentId for fallback lookups
-                    att_msg_id = get_int_value(att_record, attach_col_map.get('MessageDocumentId', -1))
+                    att_msg_id = get_int_value(att_record, msgdocid_idx)
                     if att_msg_id:
-                        if att_msg_id not in msgdocid_to_attach:
-                            msgdocid_to_attach[att_msg_id] = []
                         msgdocid_to_attach[att_msg_id].append(i)
                 except:
                     pass
@@ -1212,7 +1453,10 @@ class MainWindow(QMainWindow):
         profiler.start("Load Folders")
         self.folder_tree.clear()
         self.folders = {}
+        self._folder_path_cache = {}
         self.folder_special_map = {}  # Map FolderId -> SpecialFolderNumber
+        self.messages_by_folder.clear()
+        self.hidden_records = set()
 
         if not self.current_mailbox:
             self.status.showMessage("No mailbox selected")
@@ -1260,6 +1504,10 @@ class MainWindow(QMainWindow):
 
         if folder_table:
             folder_col_map = get_column_map(folder_table)
+            fid_idx = folder_col_map.get('FolderId', -1)
+            parent_fid_idx = folder_col_map.get('ParentFolderId', -1)
+            special_num_idx = folder_col_map.get('SpecialFolderNumber', -1)
+            display_name_idx = folder_col_map.get('DisplayName', -1)
             self.status.showMessage("Reading folder metadata...")
 
             for i in range(folder_table.get_number_of_records()):
@@ -1268,10 +1516,10 @@ class MainWindow(QMainWindow):
                     if not record:
                         continue
 
-                    fid = get_bytes_value(record, folder_col_map.get('FolderId', -1))
-                    parent_fid = get_bytes_value(record, folder_col_map.get('ParentFolderId', -1))
-                    special_num_raw = get_bytes_value(record, folder_col_map.get('SpecialFolderNumber', -1))
-                    display_name_raw = get_bytes_value(record, folder_col_map.get('DisplayName', -1))
+                    fid = get_bytes_value(record, fid_idx)
+                    parent_fid = get_bytes_value(record, parent_fid_idx)
+                    special_num_raw = get_bytes_value(record, special_num_idx)
+                    display_name_raw = get_bytes_value(record, display_name_idx)
 
                     if not fid:
                         continue
@@ -1281,14 +1529,15 @@ class MainWindow(QMainWindow):
                     # Get special folder number
                     special_num = None
                     if special_num_raw and len(special_num_raw) >= 4:
-                        special_num = struct.unpack('<I', special_num_raw[:4])[0]
+                        special_num = _U32.unpack_from(special_num_raw)[0]
 
                     # Try to decode display name (often encrypted)
                     display_name = None
-                    if display_name_raw:
+                    if display_name_raw and not len(display_name_raw) % 2:  # odd length is not UTF-16
                         try:
                             decoded = display_name_raw.decode('utf-16-le').rstrip('\x00')
-                            if decoded and all(c.isprintable() or c.isspace() for c in decoded):
+                            if decoded and (decoded.isprintable()
+                                            or ''.join(decoded.split()).isprintable()):
                                 display_name = decoded
                         except:
                             pass
@@ -1314,52 +1563,45 @@ class MainWindow(QMainWindow):
             self.status.showMessage(f"Message table not found: {msg_table_name}")
             return
 
-        self.status.showMessage(f"Scanning messages to build folder list...")
-
-        col_map = get_column_map(msg_table)
-        folder_counts = defaultdict(int)
+        total_records = msg_table.get_number_of_records()
+        self.progress.setVisible(True)
+        self.progress.setRange(0, total_records)
+        self.status.showMessage(f"Scanning {total_records} messages to build folder list...")
+
+        col_map = self._cached_msg_col_map or get_column_map(msg_table)
+        folder_id_idx = col_map.get('FolderId', -1)
+        is_hidden_idx = col_map.get('IsHidden', -1)
+        messages_by_folder = self.messages_by_folder
+        hidden_records = self.hidden_records
+        # Hidden vs visible per folder, counted in the same pass
+        folder_hidden_counts = defaultdict(int)
 
-        # Also try to detect mailbox owner from DisplayTo in Sent Items
         self.mailbox_owner = None
-        display_to_counts = defaultdict(int)
 
-        for i in range(msg_table.get_number_of_records()):
+        # One pass builds the per-folder message index and hidden counts
+        for i in range(total_records):
+            # Update progress every 100 messages
+            if i % 100 == 0:
+                self.progress.setValue(i)
+                QApplication.processEvents()
+
             try:
                 record = msg_table.get_record(i)
                 if not record:
                     continue
-                folder_id = get_folder_id(record, col_map.get('FolderId', -1))
+                folder_id = get_folder_id(record, folder_id_idx)
                 if folder_id:
-                    folder_counts[folder_id] += 1
-
-                    # Check if this folder is Sent Items (special_num=11)
-                    info = folder_info.get(folder_id)
-                    if info and info.get('special_num') == 11:
-                        # Get DisplayTo to find recipients (mailbox owner sent to these)
-                        display_to = get_string_value(record, col_map.get('DisplayTo', -1))
-                        if display_to:
-                            display_to_counts[display_to] += 1
+                    messages_by_folder[folder_id].append(i)
+                    if get_bool_value(record, is_hidden_idx):
+                        folder_hidden_counts[folder_id] += 1
+                        hidden_records.add(i)
             except:
                 pass
 
-        # Detect mailbox owner from most common DisplayTo in Sent Items
-        # (The mailbox owner often sends emails to themselves or common recipients)
-        # Actually, for Sent Items we need to look at the From field, not DisplayTo
-        # Let's try PropertyBlob for sender info instead
+        self.progress.setVisible(False)
 
-        # Count hidden vs visible per folder
-        folder_hidden_counts = defaultdict(int)
-        for i in range(msg_table.get_number_of_records()):
-            try:
-                record = msg_table.get_record(i)
-                if not record:
-                    continue
-                folder_id = get_folder_id(record, col_map.get('FolderId', -1))
-                is_hidden = get_bytes_value(record, col_map.get('IsHidden', -1))
-                if folder_id and is_hidden and is_hidden != b'\x00':
-                    folder_hidden_counts[folder_id] += 1
-            except:
-                pass
+        # Message counts fall out of the index, in first-seen folder order
+        folder_counts = {folder_id: len(indices) for folder_id, indices in messages_by_folder.items()}
 
         for folder_id, count in folder_counts.items():
             # Get folder name from special number or display name
@@ -1390,11 +1632,7 @@ class MainWindow(QMainWindow):
                 # Extract folder number from position 8-12 in the hex string
                 if len(folder_id) >= 20:
                     folder_num = folder_id[-12:-8]  # Get the 4 hex chars for folder number
-                    if HAS_FOLDER_MAPPING:
-                        from core.folder_mapping import FOLDER_NUM_TO_NAME
-                        final_name = FOLDER_NUM_TO_NAME.get(folder_num, f'Folder_{folder_num}')
-                    else:
-                        final_name = f'Folder_{folder_num}'
+                    final_name = FOLDER_NUM_TO_NAME.get(folder_num, f'Folder_{folder_num}')
                 else:
                     final_name = f'Folder_{folder_id[-8:]}'
 
@@ -1411,18 +1649,38 @@ class MainWindow(QMainWindow):
                 'parent_id': info.get('parent_hex')
             }
 
-        # Build hierarchical tree
+        # Build hierarchical tree with repaints and item signals held until it is complete
+        self.folder_tree.setUpdatesEnabled(False)
+        self.folder_tree.blockSignals(True)
+
         # First, create items for all folders
         folder_items = {}
+        tree_parents = {}  # folder_id -> parent folder_id, for items placed as children
         root_folders = []
 
-        # Sort folders: special folders first (by number), then by name
+        # Depth below the nearest folder whose parent is unknown, so every parent
+        # is created before its children; a parent cycle is cut where it closes
+        depths = {}
+
+        def folder_depth(folder_id):
+            chain = []
+            fid = folder_id
+            while fid in self.folders and fid not in depths and fid not in chain:
+                chain.append(fid)
+                fid = self.folders[fid].get('parent_id')
+            depth = -1 if fid in chain else depths.get(fid, -1)
+            for fid in reversed(chain):
+                depth += 1
+                depths[fid] = depth
+            return depths[folder_id]
+
+        # Sort folders: parents first, then special folders (by number), then by name
         def sort_key(item):
             folder_id, folder = item
             special = folder.get('special_num')
             if special is not None:
-                return (0, special, folder['display_name'])
-            return (1, 999, folder['display_name'])
+                return (folder_depth(folder_id), 0, special, folder['display_name'])
+            return (folder_depth(folder_id), 1, 999, folder['display_name'])
 
         for folder_id, folder in sorted(self.folders.items(), key=sort_key):
             item = QTreeWidgetItem()
@@ -1435,39 +1693,33 @@ class MainWindow(QMainWindow):
             else:
                 item.setText(1, str(visible))
             item.setData(0, Qt.ItemDataRole.UserRole, folder_id)
-            folder_items[folder_id] = item
 
-            # Check if has parent
+            # Parents sort first, so a known parent already has its item
             parent_id = folder.get('parent_id')
             if parent_id and parent_id in folder_items:
                 folder_items[parent_id].addChild(item)
-            elif parent_id and parent_id in self.folders:
-                # Parent exists but item not created yet - will be handled later
-                pass
+                tree_parents[folder_id] = parent_id
             else:
                 root_folders.append((folder_id, item))
+            folder_items[folder_id] = item
 
         # Add root folders to tree
-        for folder_id, item in root_folders:
-            self.folder_tree.addTopLevelItem(item)
+        self.folder_tree.addTopLevelItems([item for _, item in root_folders])
 
-        # Handle orphan children (parent was processed after child)
-        for folder_id, folder in self.folders.items():
-            parent_id = folder.get('parent_id')
-            if parent_id and parent_id in folder_items:
-                item = folder_items[folder_id]
-                parent_item = folder_items[parent_id]
-                # Check if not already added
-                if item.parent() is None and self.folder_tree.indexOfTopLevelItem(item) == -1:
-                    parent_item.addChild(item)
-
-        # Expand all folders with messages
-        for folder_id, item in folder_items.items():
+        # Expand the ancestors of all folders with messages, each one once; a chain
+        # walk stops at the first ancestor already collected
+        to_expand = set()
+        for folder_id in folder_items:
             if self.folders[folder_id]['message_count'] > 0:
-                parent = item.parent()
-                while parent:
-                    parent.setExpanded(True)
-                    parent = parent.parent()
+                parent_id = tree_parents.get(folder_id)
+                while parent_id and parent_id not in to_expand:
+                    to_expand.add(parent_id)
+                    parent_id = tree_parents.get(parent_id)
+        for folder_id in to_expand:
+            folder_items[folder_id].setExpanded(True)
+
+        self.folder_tree.blockSignals(False)
+        self.folder_tree.setUpdatesEnabled(True)
 
         # Detect mailbox owner from Sent Items
         self._detect_mailbox_owner()
@@ -1480,9 +1732,16 @@ class MainWindow(QMainWindow):
         self.mailbox_owner = None
         self.mailbox_email = None
 
-        # Read owner from Mailbox table
+        # Owner already read by LoadWorker (same first-match order); the Mailbox
+        # table is only scanned again when that name is missing or a system mailbox
+        cached_owner = self.mailbox_owners.get(self.current_mailbox)
         mailbox_table = self.tables.get('Mailbox')
-        if mailbox_table:
+        if cached_owner and 'SystemMailbox' not in cached_owner:
+            self.mailbox_owner = cached_owner
+            owner_lower = cached_owner.lower().replace(' ', '')
+            self.mailbox_email = f"{owner_lower}@unknown"
+            self.owner_label.setText(f"Owner: {self.mailbox_owner} <{self.mailbox_email}>")
+        elif mailbox_table:
             col_map = get_column_map(mailbox_table)
             mb_num_idx = col_map.get('MailboxNumber', -1)
             owner_name_idx = col_map.get('MailboxOwnerDisplayName', -1)
@@ -1497,8 +1756,7 @@ class MainWindow(QMainWindow):
                     # Check if this is the current mailbox
                     mb_num_data = record.get_value_data(mb_num_idx)
                     if mb_num_data:
-                        import struct
-                        mb_num = struct.unpack('<I', mb_num_data)[0]
+                        mb_num = _U32.unpack(mb_num_data)[0]
                         if mb_num != self.current_mailbox:
                             continue
 
@@ -1554,54 +1812,11 @@ class MainWindow(QMainWindow):
             self.calendar_extractor = None
         profiler.stop("Load Folders")
 
-    def _index_messages(self):
-        """Index messages by folder with progress indication."""
-        profiler.start("Index Messages")
-        self.messages_by_folder.clear()
-
-        if not self.current_mailbox:
-            return
-
-        msg_table_name = f"Message_{self.current_mailbox}"
-        msg_table = self.tables.get(msg_table_name)
-
-        if not msg_table:
-            return
-
-        col_map = get_column_map(msg_table)
-        total_records = msg_table.get_number_of_records()
-
-        # Show progress
-        self.progress.setVisible(True)
-        self.progress.setRange(0, total_records)
-        self.status.showMessage(f"Indexing {total_records} messages...")
-
-        for i in range(total_records):
-            # Update progress every 100 messages
-            if i % 100 == 0:
-                self.progress.setValue(i)
-                QApplication.processEvents()
-
-            try:
-                record = msg_table.get_record(i)
-                if not record:
-                    continue
-
-                folder_id = get_folder_id(record, col_map.get('FolderId', -1))
-                if folder_id:
-                    self.messages_by_folder[folder_id].append(i)
-            except:
-                pass
-
-        self.progress.setVisible(False)
-        profiler.stop("Index Messages")
-        self.status.showMessage(f"Indexed {total_records} messages into {len(self.messages_by_folder)} folders")
-
     def _on_folder_selected(self):
         """Handle folder selection - load and cache all messages with optimizations."""
         profiler.start("Load Folder Messages")
         self.message_list.clear()
-        self.all_messages_cache = []
+        self.all_messages_cache = MessageListCache()
         self.export_folder_btn.setEnabled(False)
         self.export_eml_btn2.setEnabled(False)
         self.export_attach_btn.setEnabled(False)
@@ -1627,8 +1842,8 @@ class MainWindow(QMainWindow):
             self.all_messages_cache = self.folder_messages_cache[cache_key]
             self._apply_filters()
             total = len(self.all_messages_cache)
-            hidden_count = sum(1 for m in self.all_messages_cache if m.get('is_hidden'))
-            failed_count = sum(1 for m in self.all_messages_cache if m.get('has_error'))
+            hidden_count = sum(self.all_messages_cache.is_hidden)
+            failed_count = len(self.all_messages_cache.filter_index[3])
             status_parts = [f"{total} messages"]
             if hidden_count:
                 status_parts.append(f"{hidden_count} hidden")
@@ -1644,7 +1859,16 @@ class MainWindow(QMainWindow):
         if not msg_table:
             return
 
-        col_map = get_column_map(msg_table)
+        col_map = self._cached_msg_col_map or get_column_map(msg_table)
+        idx_date = col_map.get('DateReceived', -1)
+        idx_read = col_map.get('IsRead', -1)
+        idx_attach = col_map.get('HasAttachments', -1)
+        # IsHidden was already read for every record by the folder scan
+        hidden_records = self.hidden_records
+
+        # Mailbox owner fallback for empty From/To fields
+        owner_name = getattr(self, 'mailbox_owner', '') or ''
+        owner_email = getattr(self, 'mailbox_email', '') or ''
 
         # Show progress bar
         total_msgs = min(len(message_indices), 2000)
@@ -1668,14 +1892,13 @@ class MainWindow(QMainWindow):
                     continue
 
                 # Check IsHidden flag
-                is_hidden = get_bytes_value(record, col_map.get('IsHidden', -1))
-                is_hidden_val = bool(is_hidden and is_hidden != b'\x00')
+                is_hidden_val = rec_idx in hidden_records
 
                 if is_hidden_val:
                     hidden_count += 1
 
                 # Get date (fast - just struct unpack)
-                date_received = get_filetime_value(record, col_map.get('DateReceived', -1))
+                date_received = get_filetime_value(record, idx_date)
                 date_str = date_received.strftime("%Y-%m-%d %H:%M") if date_received else ""
 
                 # Full message extraction for accurate From/To/Subject
@@ -1705,20 +1928,14 @@ class MainWindow(QMainWindow):
                         has_error = True
                 else:
                     # Fallback: basic extraction
-                    is_read_raw = get_bytes_value(record, col_map.get('IsRead', -1))
-                    is_read = bool(is_read_raw and is_read_raw != b'\x00')
-                    has_attach_raw = get_bytes_value(record, col_map.get('HasAttachments', -1))
-                    has_attach = bool(has_attach_raw and has_attach_raw != b'\x00')
+                    is_read = get_bool_value(record, idx_read)
+                    has_attach = get_bool_value(record, idx_attach)
 
                 # Fallback for empty fields - use mailbox owner
-                if not from_display and hasattr(self, 'mailbox_owner') and self.mailbox_owner:
-                    from_display = self.mailbox_owner
-                if not to_display and hasattr(self, 'mailbox_owner') and self.mailbox_owner:
-                    to_display = self.mailbox_owner
-                if not from_email and hasattr(self, 'mailbox_email') and self.mailbox_email:
-                    from_email = self.mailbox_email
-                if not to_email and hasattr(self, 'mailbox_email') and self.mailbox_email:
-                    to_email = self.mailbox_email
+                from_display = from_display or owner_name
+                to_display = to_display or owner_name
+                from_email = from_email or owner_email
+                to_email = to_email or owner_email
 
             except Exception as e:
                 has_error = True
@@ -1735,21 +1952,12 @@ class MainWindow(QMainWindow):
                 failed_count += 1
 
             # Cache message data - use emails as primary display
-            msg_data = {
-                'rec_idx': rec_idx,
-                'date': date_str,
-                'date_obj': date_received,
-                'from': from_email or from_display,  # Show email, fallback to name
-                'to': to_email or to_display,        # Show email, fallback to name
-                'from_email': from_email,
-                'to_email': to_email,
-                'subject': subject,
-                'is_read': is_read,
-                'has_attach': has_attach,
-                'is_hidden': is_hidden_val,
-                'has_error': has_error,
-            }
-            self.all_messages_cache.append(msg_data)
+            self.all_messages_cache.append(
+                rec_idx, date_str,
+                from_email or from_display,  # Show email, fallback to name
+                to_email or to_display,      # Show email, fallback to name
+                from_email, to_email, subject,
+                is_read, has_attach, is_hidden_val, has_error)
 
         # Store in folder cache
         self.folder_messages_cache[cache_key] = self.all_messages_cache
@@ -1779,68 +1987,71 @@ class MainWindow(QMainWindow):
         attach_filter = self.filter_attach_cb.isChecked()
         show_hidden = self.show_hidden_cb.isChecked()
 
+        msgs = self.all_messages_cache
+        items = []
         shown_count = 0
-        for msg in self.all_messages_cache:
-            # Apply hidden filter
-            if msg.get('is_hidden') and not show_hidden:
-                continue
+        # Hidden rows are filtered by the index; without other filters the
+        # first 500 candidates are exactly the rows shown
+        rows = msgs.rows(read_filter, include_hidden=show_hidden)
+        if not search_text and not attach_filter:
+            rows = rows[:500]
+        for row in rows:
+            is_hidden = msgs.is_hidden[row]
 
             # Apply search filter (searches names and emails)
-            if search_text:
-                searchable = f"{msg['subject']} {msg['from']} {msg['to']} {msg.get('from_email', '')} {msg.get('to_email', '')}".lower()
-                if search_text not in searchable:
-                    continue
-
-            # Apply read status filter
-            if read_filter == 1 and msg['is_read']:  # Unread only
-                continue
-            if read_filter == 2 and not msg['is_read']:  # Read only
-                continue
-            if read_filter == 3 and not msg.get('has_error'):  # Failed only
+            if search_text and search_text not in msgs.search_text[row]:
                 continue
 
             # Apply attachment filter
-            if attach_filter and not msg['has_attach']:
+            has_attach = msgs.has_attach[row]
+            if attach_filter and not has_attach:
                 continue
 
+            rec_idx = msgs.rec_idx[row]
+            subject = msgs.subject[row]
+            is_read = msgs.is_read[row]
+
             # Create list item - columns: #, Date, From, To, FromEmail, ToEmail, Subject, Att, Read
             item = QTreeWidgetItem()
-            item.setText(0, str(msg['rec_idx']))
-            item.setData(0, Qt.ItemDataRole.UserRole, msg['rec_idx'])
-            item.setText(1, msg['date'])
-            item.setText(2, msg['from'])  # From name
-            item.setText(3, msg['to'])    # To name
-            item.setText(4, msg.get('from_email', ''))  # From email
-            item.setText(5, msg.get('to_email', ''))    # To email
-            item.setText(6, msg['subject'])
-            item.setText(7, "📎" if msg['has_attach'] else "")
-            item.setText(8, "✓" if msg['is_read'] else "")
+            item.setText(0, str(rec_idx))
+            item.setData(0, Qt.ItemDataRole.UserRole, rec_idx)
+            item.setText(1, msgs.date[row])
+            item.setText(2, msgs.sender[row])     # From name
+            item.setText(3, msgs.recipient[row])  # To name
+            item.setText(4, msgs.from_email[row])  # From email
+            item.setText(5, msgs.to_email[row])    # To email
+            item.setText(6, subject)
+            item.setText(7, "📎" if has_attach else "")
+            item.setText(8, "✓" if is_read else "")
 
             # Mark unread messages as bold
-            if not msg['is_read']:
-                font = item.font(0)
-                font.setBold(True)
+            if not is_read:
                 for col in range(9):
-                    item.setFont(col, font)
+                    item.setFont(col, self._bold_font)
 
-            # Mark failed/error messages in red
-            if msg.get('has_error'):
-                item.setText(6, f"[ERROR] {msg['subject']}")
-                for col in range(9):
-                    item.setForeground(col, QColor(255, 85, 85))
+            # Mark failed/error messages in red (colored by MessageItemDelegate)
+            if msgs.has_error[row]:
+                item.setText(6, f"[ERROR] {subject}")
+                item.setData(0, MessageItemDelegate.STATE_ROLE, MessageItemDelegate.STATE_ERROR)
 
             # Mark hidden items visually (gray, lower priority than red)
-            elif msg.get('is_hidden'):
-                item.setText(6, f"[HIDDEN] {msg['subject']}")
-                for col in range(9):
-                    item.setForeground(col, QColor(128, 128, 128))
+            elif is_hidden:
+                item.setText(6, f"[HIDDEN] {subject}")
+                item.setData(0, MessageItemDelegate.STATE_ROLE, MessageItemDelegate.STATE_HIDDEN)
 
-            self.message_list.addTopLevelItem(item)
+            items.append(item)
             shown_count += 1
 
             if shown_count >= 500:
                 break
 
+        # Insert all rows at once and sort a single time afterwards, repainting once
+        self.message_list.setUpdatesEnabled(False)
+        self.message_list.setSortingEnabled(False)
+        self.message_list.addTopLevelItems(items)
+        self.message_list.setSortingEnabled(True)
+        self.message_list.setUpdatesEnabled(True)
+
         # Update status
         total = len(self.all_messages_cache)
         if shown_count < total:
@@ -1912,7 +2123,10 @@ class MainWindow(QMainWindow):
         if prop_blob:
             blob_text = ''
             try:
-                if HAS_DISSECT:
+                if email_msg._decompressed_property_blob and email_msg._raw_property_blob == prop_blob:
+                    # Already decompressed while the message was extracted
+                    blob_text = email_msg._decompressed_property_blob.decode('utf-8', errors='ignore')
+                elif HAS_DISSECT:
                     from dissect.esedb.compression import decompress as d_decompress
                     decompressed = d_decompress(prop_blob)
                     blob_text = decompressed.decode('utf-8', errors='ignore')
@@ -1922,12 +2136,12 @@ class MainWindow(QMainWindow):
                 blob_text = prop_blob.decode('utf-8', errors='ignore')
 
             # Email pattern
-            email_match = re.search(r'[\w.-]+@[\w.-]+\.\w{2,}', blob_text)
+            email_match = _CONTACT_EMAIL_RE.search(blob_text)
             if email_match:
                 fields['email'] = email_match.group()
 
             # Phone pattern
-            phone_match = re.search(r'[\+]?[\d\s\-\(\)]{7,15}', blob_text)
+            phone_match = _CONTACT_PHONE_RE.search(blob_text)
             if phone_match:
                 phone = phone_match.group().strip()
                 if len(phone) >= 7:
@@ -1936,13 +2150,11 @@ class MainWindow(QMainWindow):
         # Try HTML body for company/title
         if email_msg.body_html:
             html_text = email_msg.body_html
-            company_match = re.search(r'(?:company|organization|org)[:\s]*([^<\n]{2,50})',
-                                       html_text, re.IGNORECASE)
+            company_match = _CONTACT_COMPANY_RE.search(html_text)
             if company_match:
                 fields['company'] = company_match.group(1).strip()
 
-            title_match = re.search(r'(?:title|position|job)[:\s]*([^<\n]{2,50})',
-                                     html_text, re.IGNORECASE)
+            title_match = _CONTACT_TITLE_RE.search(html_text)
             if title_match:
                 fields['title'] = title_match.group(1).strip()
 
@@ -2299,9 +2511,9 @@ class MainWindow(QMainWindow):
         # PropertyBlob hex info (always show)
         if prop_blob:
             # Find Exchange DN
-            dn_match = re.search(rb'/O=[A-Z0-9]+/OU=[^/\x00]+(?:/CN=[^/\x00]+)*', prop_blob, re.IGNORECASE)
+            dn_match = _EXCHANGE_DN_RE.search(prop_blob)
             if dn_match:
-                dn_clean = bytes(b for b in dn_match.group() if 32 <= b < 127)
+                dn_clean = dn_match.group().translate(None, _NONPRINTABLE_ASCII)
                 parsed_text += f"\nExchange DN: {dn_clean.decode('ascii', errors='ignore')}\n"
 
         self.parsed_view.setPlainText(parsed_text)
@@ -2310,7 +2522,7 @@ class MainWindow(QMainWindow):
         # === Body View ===
         profiler.start("SM: Body Decode")
         body_text = ""
-        html_source = ""
+        html_data = None
         body_data_raw = None
         body_data_decompressed = None
 
@@ -2333,8 +2545,8 @@ class MainWindow(QMainWindow):
                                     if body_data_decompressed and len(body_data_decompressed) > 10:
                                         # Extract text from HTML
                                         body_text = extract_text_from_html(body_data_decompressed)
-                                        # Store HTML source
-                                        html_source = body_data_decompressed.decode('utf-8', errors='replace')
+                                        # Keep HTML source, decoded when an HTML tab is shown
+                                        html_data = body_data_decompressed
                                 except Exception as e:
                                     pass
                                 finally:
@@ -2344,10 +2556,10 @@ class MainWindow(QMainWindow):
                             if not body_text and body_data_raw:
                                 # Try to extract printable text directly
                                 content = body_data_raw[7:] if header_type in [0x17, 0x18, 0x19] else body_data_raw
-                                printable = bytes(b for b in content if 32 <= b <= 126 or b in [9, 10, 13])
+                                printable = content.translate(None, _NONPRINTABLE)
                                 if printable:
                                     body_text = printable.decode('ascii', errors='ignore')
-                                    html_source = body_text
+                                    html_data = body_text
             except Exception as e:
                 pass
 
@@ -2367,10 +2579,11 @@ class MainWindow(QMainWindow):
                     pass
 
             if not body_text:
-                strings = re.findall(rb'[\x20-\x7e]{10,}', prop_blob)
+                # Only the first 10 runs are shown, so stop scanning once they are found
+                strings = [m.group() for m in islice(_ASCII_STRINGS_10.finditer(prop_blob), 10)]
                 if strings:
                     body_text = "--- Extracted from PropertyBlob ---\n\n"
-                    body_text += '\n'.join(s.decode('ascii', errors='ignore') for s in strings[:10])
+                    body_text += '\n'.join(s.decode('ascii', errors='ignore') for s in strings)
 
         profiler.stop("SM: Body Decode")
 
@@ -2392,7 +2605,65 @@ Check the "HTML Source" tab for raw decompressed HTML.
 Check the "Raw Body" tab to see compressed data."""
             self.body_view.setPlainText(note)
 
-        # Set Body (HTML) view - render HTML like a browser with styles/images/links
+        # HTML tabs are decoded and rendered only when shown
+        self._html_data = html_data
+        self._html_source = None
+        self._defer_view(self.html_browser_view, self._render_html_browser)
+        self._defer_view(self.html_source_view, self._render_html_source)
+
+        # Store raw body data for toggle view; its hex dump is built when the tab is shown
+        self.current_raw_body_compressed = body_data_raw
+        self.current_raw_body_decompressed = body_data_decompressed
+        self._defer_view(self.raw_body_widget, self._update_raw_body_view)
+
+        # Update EmailMessage with rendered body content for export
+        if email_msg:
+            if body_text:
+                email_msg.body_text = body_text
+            if html_data and not email_msg.body_html:
+                email_msg.body_html = self._get_html_source()
+
+        profiler.stop("SM: Render Views")
+
+        # === Hex / ASCII Views === (built when their tabs are shown)
+        profiler.start("SM: Hex/ASCII/Cols")
+        self._defer_view(self.hex_view, self._render_hex_view, prop_blob)
+        self._defer_view(self.ascii_view, self._render_ascii_view, prop_blob)
+
+        # === All Columns === (filled when the tab is shown)
+        self._defer_view(self.columns_table, self._render_columns_table, record, columns)
+
+        profiler.stop("SM: Hex/ASCII/Cols")
+        profiler.stop("Select Message")
+
+    def _defer_view(self, widget, render, *args):
+        """Render a content tab now if it is visible, otherwise when it is shown."""
+        if self.content_tabs.currentWidget() is widget:
+            self._deferred_views.pop(widget, None)
+            render(*args)
+        else:
+            self._deferred_views[widget] = (render, args)
+
+    def _on_content_tab_changed(self, index):
+        """Render the newly shown content tab if its update was deferred."""
+        pending = self._deferred_views.pop(self.content_tabs.widget(index), None)
+        if pending:
+            render, args = pending
+            render(*args)
+
+    def _get_html_source(self):
+        """Return the current message HTML, decoding it on first use."""
+        if self._html_source is None:
+            data = self._html_data
+            if isinstance(data, bytes):
+                self._html_source = data.decode('utf-8', errors='replace')
+            else:
+                self._html_source = data or ""
+        return self._html_source
+
+    def _render_html_browser(self):
+        """Render HTML like a browser with styles/images/links."""
+        html_source = self._get_html_source()
         if html_source:
             # Wrap in proper HTML document with white background if not already a full document
             if not html_source.strip().lower().startswith('<!doctype') and not html_source.strip().lower().startswith('<html'):
@@ -2423,28 +2694,16 @@ a {{ color: #0066cc; }}
 </html>"""
             self.html_browser_view.setHtml(no_content_html)
 
-        # Set HTML Source view - show raw HTML code
+    def _render_html_source(self):
+        """Show raw HTML code."""
+        html_source = self._get_html_source()
         if html_source:
             self.html_source_view.setPlainText(html_source)
         else:
             self.html_source_view.setPlainText("(No HTML content available)")
 
-        # Store raw body data for toggle view
-        self.current_raw_body_compressed = body_data_raw
-        self.current_raw_body_decompressed = body_data_decompressed
-        self._update_raw_body_view()
-
-        # Update EmailMessage with rendered body content for export
-        if email_msg:
-            if body_text:
-                email_msg.body_text = body_text
-            if html_source:
-                email_msg.body_html = html_source
-
-        profiler.stop("SM: Render Views")
-
-        # === Hex View ===
-        profiler.start("SM: Hex/ASCII/Cols")
+    def _render_hex_view(self, prop_blob):
+        """Show a hex dump of the PropertyBlob."""
         if prop_blob:
             hex_text = f"PropertyBlob - {len(prop_blob)} bytes\n{'='*50}\n\n"
             hex_text += self._hexdump(prop_blob)
@@ -2452,20 +2711,26 @@ a {{ color: #0066cc; }}
         else:
             self.hex_view.setPlainText("No PropertyBlob data")
 
-        # === ASCII View ===
+    def _render_ascii_view(self, prop_blob):
+        """Show printable ASCII runs found in the PropertyBlob."""
         ascii_text = "ASCII Strings Found\n" + "="*50 + "\n\n"
         if prop_blob:
-            strings = re.findall(rb'[\x20-\x7e]{4,}', prop_blob)
-            for s in strings:
-                ascii_text += s.decode('ascii') + "\n"
+            runs = prop_blob.translate(_ASCII_RUN_TABLE).split(b'\x00')
+            ascii_text += ''.join(s.decode('ascii') + "\n" for s in runs if len(s) >= 4)
         self.ascii_view.setPlainText(ascii_text)
 
-        # === All Columns ===
+    def _render_columns_table(self, record, columns):
+        """Fill the All Columns table with raw values of the given record."""
+        self.columns_table.setUpdatesEnabled(False)
+        # Names only change with the mailbox's column list; keep them across messages
+        same_columns = columns is self._columns_table_columns
+        self._columns_table_columns = columns
         self.columns_table.setRowCount(len(columns))
         for row, (idx, name, ctype) in enumerate(columns):
             val = record.get_value_data(idx)
 
-            self.columns_table.setItem(row, 0, QTableWidgetItem(name))
+            if not same_columns:
+                self.columns_table.setItem(row, 0, QTableWidgetItem(name))
             self.columns_table.setItem(row, 1, QTableWidgetItem(str(len(val)) if val else "0"))
 
             if val:
@@ -2476,17 +2741,21 @@ a {{ color: #0066cc; }}
                 self.columns_table.setItem(row, 2, QTableWidgetItem(display))
             else:
                 self.columns_table.setItem(row, 2, QTableWidgetItem("(empty)"))
-
-        profiler.stop("SM: Hex/ASCII/Cols")
-        profiler.stop("Select Message")
+        self.columns_table.setUpdatesEnabled(True)
 
     def _hexdump(self, data, width=16):
-        lines = []
-        for i in range(0, len(data), width):
-            chunk = data[i:i+width]
-            hex_part = ' '.join(f'{b:02x}' for b in chunk)
-            ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
-            lines.append(f'{i:08x}  {hex_part:<{width*3}}  {ascii_part}')
+        more = len(data) - HEXDUMP_MAX_BYTES
+        if more > 0:
+            return (self._hexdump(data[:HEXDUMP_MAX_BYTES], width)
+                    + f"\n... {more} more bytes not shown")
+        # ASCII column translated once; full rows need no hex padding, only the tail does
+        ascii_all = data.translate(_HEXDUMP_ASCII).decode('ascii')
+        view = memoryview(data)
+        full = len(data) - len(data) % width
+        lines = [f'{i:08x}  {view[i:i+width].hex(" ")}   {ascii_all[i:i+width]}'
+                 for i in range(0, full, width)]
+        if full < len(data):
+            lines.append(f'{full:08x}  {view[full:].hex(" "):<{width*3}}  {ascii_all[full:]}')
         return '\n'.join(lines)
 
     def _on_show_hidden_changed(self, state):
@@ -2502,6 +2771,15 @@ a {{ color: #0066cc; }}
         """Update the raw body view based on toggle state."""
         show_compressed = self.raw_compressed_cb.isChecked()
 
+        # Same toggle state and same body objects: the view already shows this text
+        compressed = self.current_raw_body_compressed
+        decompressed = self.current_raw_body_decompressed
+        last = self._raw_body_rendered
+        if (last is not None and last[0] == show_compressed
+                and last[1] is compressed and last[2] is decompressed):
+            return
+        self._raw_body_rendered = (show_compressed, compressed, decompressed)
+
         if show_compressed and self.current_raw_body_compressed:
             # Show hex dump of compressed data
             data = self.current_raw_body_compressed
@@ -2522,8 +2800,7 @@ a {{ color: #0066cc; }}
             text += f"Type: {type_desc}\n"
 
             if len(data) > 2:
-                import struct
-                uncompressed_size = struct.unpack('<H', data[1:3])[0]
+                uncompressed_size = int.from_bytes(data[1:3], 'little')
                 text += f"Expected uncompressed size: {uncompressed_size} bytes\n"
 
             text += f"\nDecompression: {'dissect.esedb (proper LZXPRESS)' if HAS_DISSECT else 'fallback decoder'}\n"
@@ -2536,7 +2813,7 @@ a {{ color: #0066cc; }}
             text = f"Raw NativeBody (Decompressed) - {len(data)} bytes\n{'='*60}\n\n"
             text += f"Decompression method: {'dissect.esedb' if HAS_DISSECT else 'fallback'}\n\n"
             # Show as text if mostly printable
-            printable_count = sum(1 for b in data if 32 <= b <= 126 or b in [9, 10, 13])
+            printable_count = len(data.translate(None, _NONPRINTABLE))
             if printable_count > len(data) * 0.7:
                 text += data.decode('utf-8', errors='replace')
             else:
@@ -2548,10 +2825,12 @@ a {{ color: #0066cc; }}
 
     def _on_refresh(self):
         if self.current_mailbox:
-            # Clear folder cache to force reload
+            # Clear folder cache and rebuild the attachment index to force reload
             self.folder_messages_cache.clear()
+            self._cached_inid_to_record = None
+            self._cached_msgdocid_to_attach = None
+            self._build_mailbox_caches()
             self._load_folders()
-            self._index_messages()
 
     def _toggle_from_email_column(self):
         """Toggle From Email column visibility."""
@@ -2585,34 +2864,18 @@ a {{ color: #0066cc; }}
         if not blob or len(blob) < 4:
             return []
 
-        inids = []
-
         # Pattern 1: Standard format - header bytes followed by 21XX pairs where XX is Inid
-        i = 0
-        while i < len(blob) - 1:
-            if blob[i] == 0x21:  # Marker for Inid reference
-                inid = blob[i + 1]
-                inids.append(inid)
-                i += 2
-            else:
-                i += 1
+        # 0x21 = marker for Inid reference; the regex walks the pairs in C
+        inids = list(b''.join(_SUBOBJ_INID_RE.findall(blob)))
 
         if inids:
             return inids
 
         # Pattern 2: 0x0f format - found in some Exchange versions
         # Structure: first byte=length, then data with Inid values at positions after 0x84 markers
-        # The Inid values are stored with +20 offset
+        # The Inid values are stored with +20 offset; the regex only keeps Inids 1..100
         if len(blob) >= 8 and blob[0] == 0x0f:
-            # Look for 0x84 markers followed by encoded Inid
-            for i in range(len(blob) - 1):
-                if blob[i] == 0x84:
-                    encoded = blob[i + 1]
-                    # Decode with -20 offset
-                    if encoded >= 20:
-                        potential_inid = encoded - 20
-                        if 1 <= potential_inid <= 100:  # Reasonable Inid range
-                            inids.append(potential_inid)
+            inids = [encoded - 20 for encoded in b''.join(_SUBOBJ_ENCODED_INID_RE.findall(blob))]
 
         if inids:
             return inids
@@ -2630,8 +2893,7 @@ a {{ color: #0066cc; }}
         self.save_all_attach_btn.setEnabled(False)
 
         # Check if message has attachments
-        has_attach = get_bytes_value(record, col_map.get('HasAttachments', -1))
-        if not has_attach or has_attach == b'\x00':
+        if not get_bool_value(record, col_map.get('HasAttachments', -1)):
             self.content_tabs.setTabText(2, "Attachments (0)")
             profiler.stop("Load Attachments")
             return
@@ -2640,6 +2902,12 @@ a {{ color: #0066cc; }}
         subobjects = get_bytes_value(record, col_map.get('SubobjectsBlob', -1))
         linked_inids = self._parse_subobjects_blob(subobjects) if subobjects else []
 
+        # SubobjectsBlob present but without Inid references: nothing to look up
+        if subobjects and not linked_inids:
+            self.content_tabs.setTabText(2, "Attachments (0)")
+            profiler.stop("Load Attachments")
+            return
+
         # Get attachment table
         attach_table_name = f"Attachment_{self.current_mailbox}"
         attach_table = self.tables.get(attach_table_name)
@@ -2654,29 +2922,24 @@ a {{ color: #0066cc; }}
 
         # Load linked attachments only (no fallback to avoid duplicates)
         profiler.start("LA: Find Records")
-        records_to_load = []
-        use_fallback = False
+        records_to_load = ()
 
         if linked_inids and linked_inids != ['FALLBACK']:
-            for inid_val in linked_inids:
-                if inid_val in inid_to_record:
-                    records_to_load.append(inid_to_record[inid_val])
-        elif linked_inids == ['FALLBACK'] and subobjects:
-            # SubobjectsBlob exists but uses different format - use cached MessageDocumentId lookup
-            use_fallback = True
+            # One dict probe per distinct Inid; misses (external Inids) are dropped
+            records_to_load = [rec for rec in map(inid_to_record.get, dict.fromkeys(linked_inids))
+                               if rec is not None]
+        elif linked_inids == ['FALLBACK'] or not subobjects:
+            # SubobjectsBlob in a different format, or none at all - use the cached
+            # MessageDocumentId index instead of scanning all records
             msg_doc_id = get_int_value(record, col_map.get('MessageDocumentId', -1))
             if msg_doc_id and self._cached_msgdocid_to_attach:
-                records_to_load = list(self._cached_msgdocid_to_attach.get(msg_doc_id, []))
-        elif not subobjects:
-            # No SubobjectsBlob - use cached MessageDocumentId lookup instead of scanning all records
-            msg_doc_id = get_int_value(record, col_map.get('MessageDocumentId', -1))
-            if msg_doc_id and self._cached_msgdocid_to_attach:
-                records_to_load = list(self._cached_msgdocid_to_attach.get(msg_doc_id, []))
+                records_to_load = self._cached_msgdocid_to_attach.get(msg_doc_id, ())
         # If SubobjectsBlob exists but has no 0x21 markers, it may be embedded messages
         # In that case, don't load any attachments from the attachment table
         profiler.stop("LA: Find Records")
 
         profiler.start(f"LA: Read {len(records_to_load)} records")
+        seen = set()  # (filename, size) of attachments already listed
         for i in records_to_load:
             try:
                 att_record = attach_table.get_record(i)
@@ -2693,13 +2956,20 @@ a {{ color: #0066cc; }}
 
                 if not filename:
                     name_col = get_bytes_value(att_record, attach_col_map.get('Name', -1))
-                    if name_col:
-                        try:
-                            decoded = name_col.decode('utf-16-le').rstrip('\x00')
-                            if decoded and all(c.isprintable() for c in decoded):
-                                filename = decoded
-                        except:
-                            pass
+                    # UTF-16LE needs an even byte count; odd lengths never decode
+                    if name_col and len(name_col) % 2 == 0:
+                        low = name_col[0::2].rstrip(b'\x00')
+                        if (low and name_col[1::2].count(0) == len(name_col) // 2
+                                and not low.translate(None, _PRINTABLE_ASCII)):
+                            # ASCII-only name: validated on the low bytes, no UTF-16 decode
+                            filename = low.decode('ascii')
+                        else:
+                            try:
+                                decoded = name_col.decode('utf-16-le').rstrip('\x00')
+                                if decoded and decoded.isprintable():
+                                    filename = decoded
+                            except:
+                                pass
 
                 if not filename:
                     filename = f"attachment_{i}.bin"
@@ -2714,22 +2984,18 @@ a {{ color: #0066cc; }}
                 content_size = 0
                 if size_data:
                     if len(size_data) == 8:
-                        content_size = struct.unpack('<Q', size_data)[0]
+                        content_size = _U64.unpack(size_data)[0]
                     elif len(size_data) == 4:
-                        content_size = struct.unpack('<I', size_data)[0]
+                        content_size = _U32.unpack(size_data)[0]
 
                 display_name = f"{filename} ({content_size} bytes)" if content_size > 0 else f"{filename}"
 
-                # Deduplicate by filename
-                is_duplicate = False
-                for existing in self.current_attachments:
-                    if existing[0] == filename:
-                        is_duplicate = True
-                        break
-
-                if not is_duplicate:
+                # Deduplicate by filename and size
+                key = (filename, content_size)
+                if key not in seen:
+                    seen.add(key)
                     # Store metadata only - data loaded on demand via _get_attachment_data()
-                    self.current_attachments.append((filename, content_type, content_size, False, i))
+                    self.current_attachments.append(AttachmentRef(filename, content_type, content_size, i))
 
                     item = QListWidgetItem(display_name)
                     item.setData(Qt.ItemDataRole.UserRole, len(self.current_attachments) - 1)
@@ -2763,19 +3029,21 @@ a {{ color: #0066cc; }}
             if not att_record:
                 return None
 
-            content = get_bytes_value(att_record, attach_col_map.get('Content', -1))
-            if not content:
+            content_idx = attach_col_map.get('Content', -1)
+            if content_idx < 0:
                 return None
 
-            # Long Value reference
-            if len(content) == 4:
-                content_idx = attach_col_map.get('Content', -1)
-                if content_idx >= 0 and att_record.is_long_value(content_idx):
-                    lv = att_record.get_value_data_as_long_value(content_idx)
-                    if lv and hasattr(lv, 'get_data'):
-                        lv_data = lv.get_data()
-                        if lv_data and len(lv_data) > 0:
-                            return lv_data
+            # Long Value: read it directly instead of fetching the 4-byte reference first
+            if att_record.is_long_value(content_idx):
+                lv = att_record.get_value_data_as_long_value(content_idx)
+                if lv and hasattr(lv, 'get_data'):
+                    lv_data = lv.get_data()
+                    if lv_data and len(lv_data) > 0:
+                        return lv_data
+                return None
+
+            content = get_bytes_value(att_record, content_idx)
+            if not content:
                 return None
 
             # UTF-16LE BOM content
@@ -2806,7 +3074,7 @@ a {{ color: #0066cc; }}
             profiler.stop("Export EML")
             return
 
-        subject_safe = re.sub(r'[<>:"/\\|?*]', '_', self.current_cal_event.subject or 'event')[:50]
+        subject_safe = (self.current_cal_event.subject or 'event').translate(_FILENAME_UNSAFE)[:50]
         default_name = f"record_{self.current_record_idx}_{subject_safe}.ics"
 
         path, _ = QFileDialog.getSaveFileName(
@@ -2835,7 +3103,7 @@ a {{ color: #0066cc; }}
             profiler.stop("Export EML")
             return
 
-        name_safe = re.sub(r'[<>:"/\\|?*]', '_', self.current_contact.get('name', 'contact'))[:50]
+        name_safe = self.current_contact.get('name', 'contact').translate(_FILENAME_UNSAFE)[:50]
         default_name = f"record_{self.current_record_idx}_{name_safe}.vcf"
 
         path, _ = QFileDialog.getSaveFileName(
@@ -2868,7 +3136,7 @@ a {{ color: #0066cc; }}
             profiler.stop("Export EML")
             return
 
-        subject_safe = re.sub(r'[<>:"/\\|?*]', '_', self.current_email_message.subject or 'no_subject')[:50]
+        subject_safe = (self.current_email_message.subject or 'no_subject').translate(_FILENAME_UNSAFE)[:50]
         default_name = f"record_{self.current_record_idx}_{subject_safe}.eml"
 
         path, _ = QFileDialog.getSaveFileName(
@@ -2881,9 +3149,9 @@ a {{ color: #0066cc; }}
             return
 
         try:
-            eml_content = self.current_email_message.to_eml()
+            # Single message: stream to the file; write_eml_file's reusable buffer is for pool threads
             with open(path, 'wb') as f:
-                f.write(eml_content)
+                self.current_email_message.write_eml(f)
             self.status.showMessage(f"Exported email to {path}")
             QMessageBox.information(self, "Export", f"Email saved to:\n{path}")
         except Exception as e:
@@ -2900,32 +3168,36 @@ a {{ color: #0066cc; }}
         if not output_dir:
             return
 
+        out_dir = Path(output_dir)
+        next_counter = {}  # filename -> first suffix not yet taken by this export
         saved = 0
         skipped = 0
         for att in self.current_attachments:
-            filename = att[0]
-            is_external = att[3] if len(att) > 3 else False
+            filename = att.filename
 
-            if is_external:
+            if att.is_external:
                 skipped += 1
                 continue
 
             try:
-                data = self._get_attachment_data(att[4])
+                data = self._get_attachment_data(att.record_idx)
                 if not data:
                     skipped += 1
                     continue
 
-                out_path = Path(output_dir) / filename
-                # Handle duplicate filenames
-                counter = 1
-                while out_path.exists():
-                    name, ext = os.path.splitext(filename)
-                    out_path = Path(output_dir) / f"{name}_{counter}{ext}"
-                    counter += 1
-
-                with open(out_path, 'wb') as f:
-                    f.write(data)
+                # Handle duplicate filenames: exclusive create, bump the suffix on collision.
+                # Names this export already wrote are skipped without another open() attempt.
+                name, ext = os.path.splitext(filename)
+                counter = next_counter.get(filename, 0)
+                out_path = out_dir / (f"{name}_{counter}{ext}" if counter else filename)
+                while True:
+                    try:
+                        write_bytes_file(out_path, data, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+                        break
+                    except FileExistsError:
+                        counter += 1
+                        out_path = out_dir / f"{name}_{counter}{ext}"
+                next_counter[filename] = counter + 1
                 saved += 1
             except Exception as e:
                 self.status.showMessage(f"Error saving {filename}: {e}")
@@ -2998,6 +3270,41 @@ a {{ color: #0066cc; }}
 
         return 'pst' if pst_radio.isChecked() else 'eml'
 
+    def _run_export_worker(self, export_func, total):
+        """Run an export loop on an ExportWorker and return its result.
+
+        `export_func(report, status)` runs off the GUI thread; `report(n)` and
+        `status(text)` are queued to the progress bar and status bar, with
+        progress sent every EXPORT_PROGRESS_STEP items. The window
+        is disabled, and closeEvent refuses to close it, until the worker finishes.
+        """
+        self.progress.setRange(0, total)
+        self.progress.setValue(0)
+        self.progress.setVisible(True)
+
+        worker = ExportWorker(export_func, total)
+        worker.progress.connect(self.progress.setValue, Qt.ConnectionType.QueuedConnection)
+        worker.status.connect(self.status.showMessage, Qt.ConnectionType.QueuedConnection)
+        loop = QEventLoop()
+        worker.finished.connect(loop.quit)
+
+        self.centralWidget().setEnabled(False)
+        self.menuBar().setEnabled(False)
+        self._export_worker = worker
+        try:
+            worker.start()
+            loop.exec()
+            worker.wait()
+        finally:
+            self._export_worker = None
+            self.menuBar().setEnabled(True)
+            self.centralWidget().setEnabled(True)
+            self.progress.setVisible(False)
+
+        if worker.error:
+            raise worker.error
+        return worker.result
+
     def _on_export_folder(self):
         """Export all messages in the current folder as EML files or PST."""
         profiler.start("Export Folder")
@@ -3043,85 +3350,102 @@ a {{ color: #0066cc; }}
             profiler.stop("Export Folder")
             return
 
-        col_map = get_column_map(msg_table)
-
-        self.progress.setVisible(True)
-        self.progress.setRange(0, len(message_indices))
-
-        exported_eml = 0
-        exported_ics = 0
-        exported_vcf = 0
-        pst_messages = []  # Collect messages for PST mode
-        for idx, rec_idx in enumerate(message_indices):
-            self.progress.setValue(idx + 1)
-            QApplication.processEvents()
+        col_map = self._cached_msg_col_map or get_column_map(msg_table)
+        prop_blob_idx = col_map.get('PropertyBlob', -1)
+        date_sent_idx = col_map.get('DateSent', -1)
+
+        # Extractors and tables are fixed for the whole export
+        email_extractor = self.email_extractor if HAS_EMAIL_MODULE else None
+        cal_extractor = self.calendar_extractor if HAS_CALENDAR_MODULE else None
+        tables = self.tables
+        mailbox_num = self.current_mailbox
+
+        def export_records(report, status):
+            exported_eml = 0
+            exported_ics = 0
+            exported_vcf = 0
+            pst_messages = []  # Collect messages for PST mode
+            # Write pool only for EML; PST mode collects messages in memory
+            eml_pool = ThreadPoolExecutor(max_workers=EXPORT_WRITE_WORKERS) if export_format == 'eml' else None
+            eml_writes = deque()
 
             try:
-                record = msg_table.get_record(rec_idx)
-                if not record:
-                    continue
-
-                prop_blob = get_bytes_value(record, col_map.get('PropertyBlob', -1))
+                for idx, rec_idx in enumerate(message_indices):
+                    report(idx + 1)
 
-                # Detect message type
-                msg_class = ''
-                if HAS_CALENDAR_MODULE and hasattr(self, 'calendar_extractor') and self.calendar_extractor:
-                    msg_class = self.calendar_extractor.get_message_class(record, col_map)
-                is_cal = (bool(msg_class) and HAS_CALENDAR_MODULE
-                          and self.calendar_extractor.is_calendar_item(msg_class))
-                is_vcf = msg_class.upper().startswith('IPM.CONTACT') if msg_class else False
-
-                date_sent = get_filetime_value(record, col_map.get('DateSent', -1))
-                date_str = date_sent.strftime("%Y%m%d_%H%M%S") if date_sent else "nodate"
-
-                # Extract full EmailMessage for EML/VCF export
-                email_msg = None
-                if not is_cal and HAS_EMAIL_MODULE and self.email_extractor:
-                    email_msg = self.email_extractor.extract_message(
-                        record, col_map, rec_idx, folder_name=folder_name,
-                        tables=self.tables, mailbox_num=self.current_mailbox)
-
-                # Get subject from EmailMessage
-                subject = email_msg.subject if email_msg else ''
-                subject_safe = re.sub(r'[<>:"/\\|?*]', '_', subject or 'no_subject')[:50]
-
-                if is_cal and export_format == 'eml':
-                    # Export as ICS (EML mode only)
-                    cal_event = self.calendar_extractor.extract_event(record, col_map, rec_idx)
-                    if cal_event:
-                        subject_safe = re.sub(r'[<>:"/\\|?*]', '_', cal_event.subject or 'event')[:50]
-                        filename = f"{date_str}_{rec_idx}_{subject_safe}.ics"
-                        out_path = Path(output_dir) / filename
-                        with open(out_path, 'w', encoding='utf-8') as f:
-                            f.write(cal_event.to_ics())
-                        exported_ics += 1
-                elif is_vcf and export_format == 'eml':
-                    # Export as VCF (EML mode only)
-                    contact = self._extract_contact_fields(email_msg, prop_blob)
-                    vcard = self._build_vcard(contact)
-                    if vcard:
-                        name_safe = re.sub(r'[<>:"/\\|?*]', '_', contact.get('name', 'contact'))[:40]
-                        filename = f"{date_str}_{rec_idx}_{name_safe}.vcf"
-                        out_path = Path(output_dir) / filename
-                        with open(out_path, 'w', encoding='utf-8') as f:
-                            f.write(vcard)
-                        exported_vcf += 1
-                elif email_msg:
-                    if export_format == 'pst':
-                        pst_messages.append((email_msg, folder_name))
-                    else:
-                        # Export as EML using EmailMessage.to_eml()
-                        filename = f"{date_str}_{rec_idx}_{subject_safe}.eml"
-                        eml_content = email_msg.to_eml()
-                        out_path = Path(output_dir) / filename
-                        with open(out_path, 'wb') as f:
-                            f.write(eml_content)
-                    exported_eml += 1
+                    try:
+                        record = msg_table.get_record(rec_idx)
+                        if not record:
+                            continue
 
-            except Exception as e:
-                self.status.showMessage(f"Error exporting record {rec_idx}: {e}")
-
-        self.progress.setVisible(False)
+                        prop_blob = get_bytes_value(record, prop_blob_idx)
+
+                        # Detect message type
+                        msg_class = ''
+                        if cal_extractor:
+                            msg_class = cal_extractor.get_message_class(record, col_map)
+                        is_cal = bool(msg_class) and cal_extractor.is_calendar_item(msg_class)
+                        is_vcf = msg_class.upper().startswith('IPM.CONTACT') if msg_class else False
+
+                        date_sent = get_filetime_value(record, date_sent_idx)
+                        date_str = date_sent.strftime("%Y%m%d_%H%M%S") if date_sent else "nodate"
+
+                        # Extract full EmailMessage for EML/VCF export
+                        email_msg = None
+                        if not is_cal and email_extractor:
+                            email_msg = email_extractor.extract_message(
+                                record, col_map, rec_idx, folder_name=folder_name,
+                                tables=tables, mailbox_num=mailbox_num)
+
+                        # Get subject from EmailMessage
+                        subject = email_msg.subject if email_msg else ''
+                        subject_safe = (subject or 'no_subject').translate(_FILENAME_UNSAFE)[:50]
+
+                        if is_cal and export_format == 'eml':
+                            # Export as ICS (EML mode only)
+                            cal_event = cal_extractor.extract_event(record, col_map, rec_idx)
+                            if cal_event:
+                                subject_safe = (cal_event.subject or 'event').translate(_FILENAME_UNSAFE)[:50]
+                                filename = f"{date_str}_{rec_idx}_{subject_safe}.ics"
+                                out_path = Path(output_dir) / filename
+                                with open(out_path, 'w', encoding='utf-8') as f:
+                                    f.write(cal_event.to_ics())
+                                exported_ics += 1
+                        elif is_vcf and export_format == 'eml':
+                            # Export as VCF (EML mode only)
+                            contact = self._extract_contact_fields(email_msg, prop_blob)
+                            vcard = self._build_vcard(contact)
+                            if vcard:
+                                name_safe = contact.get('name', 'contact').translate(_FILENAME_UNSAFE)[:40]
+                                filename = f"{date_str}_{rec_idx}_{name_safe}.vcf"
+                                out_path = Path(output_dir) / filename
+                                with open(out_path, 'w', encoding='utf-8') as f:
+                                    f.write(vcard)
+                                exported_vcf += 1
+                        elif email_msg:
+                            if export_format == 'pst':
+                                pst_messages.append((email_msg, folder_name))
+                            else:
+                                # Export as EML: serialized and written by write_eml_file on the write pool
+                                filename = f"{date_str}_{rec_idx}_{subject_safe}.eml"
+                                out_path = Path(output_dir) / filename
+                                eml_writes.append((rec_idx, eml_pool.submit(write_eml_file, out_path, email_msg)))
+                                if len(eml_writes) >= EXPORT_WRITE_BACKLOG:
+                                    exported_eml -= finish_eml_writes(eml_writes, status, EXPORT_WRITE_BACKLOG // 2)
+                            exported_eml += 1
+
+                    except Exception as e:
+                        status(f"Error exporting record {rec_idx}: {e}")
+
+                exported_eml -= finish_eml_writes(eml_writes, status)
+            finally:
+                if eml_pool:
+                    # Stops the pool threads even if the loop raised; pending writes are dropped
+                    eml_pool.shutdown(cancel_futures=True)
+            return exported_eml, exported_ics, exported_vcf, pst_messages
+
+        exported_eml, exported_ics, exported_vcf, pst_messages = self._run_export_worker(
+            export_records, len(message_indices))
 
         # Write PST file if in PST mode
         if export_format == 'pst' and pst_messages:
@@ -3176,36 +3500,36 @@ a {{ color: #0066cc; }}
             profiler.stop("Export Calendar")
             return
 
-        col_map = get_column_map(msg_table)
+        col_map = self._cached_msg_col_map or get_column_map(msg_table)
 
-        # Collect calendar events
-        events = []
-        self.progress.setVisible(True)
-        self.progress.setRange(0, len(message_indices))
+        cal_extractor = self.calendar_extractor
 
-        for idx, rec_idx in enumerate(message_indices):
-            self.progress.setValue(idx + 1)
-            QApplication.processEvents()
+        # Collect calendar events (runs on the export thread, off the GUI thread)
+        def export_records(report, status):
+            events = []
+            for idx, rec_idx in enumerate(message_indices):
+                report(idx + 1)
 
-            try:
-                record = msg_table.get_record(rec_idx)
-                if not record:
-                    continue
+                try:
+                    record = msg_table.get_record(rec_idx)
+                    if not record:
+                        continue
 
-                # Check if this is a calendar item
-                msg_class = self.calendar_extractor.get_message_class(record, col_map)
-                if not self.calendar_extractor.is_calendar_item(msg_class):
-                    continue
+                    # Check if this is a calendar item
+                    msg_class = cal_extractor.get_message_class(record, col_map)
+                    if not cal_extractor.is_calendar_item(msg_class):
+                        continue
 
-                # Extract calendar event
-                event = self.calendar_extractor.extract_event(record, col_map, rec_idx)
-                if event:
-                    events.append(event)
+                    # Extract calendar event
+                    event = cal_extractor.extract_event(record, col_map, rec_idx)
+                    if event:
+                        events.append(event)
 
-            except Exception as e:
-                self.status.showMessage(f"Error processing record {rec_idx}: {e}")
+                except Exception as e:
+                    status(f"Error processing record {rec_idx}: {e}")
+            return events
 
-        self.progress.setVisible(False)
+        events = self._run_export_worker(export_records, len(message_indices))
 
         if not events:
             QMessageBox.information(self, "Export Calendar",
@@ -3262,6 +3586,7 @@ a {{ color: #0066cc; }}
             return
 
         col_map = self._cached_msg_col_map if self._cached_msg_col_map else get_column_map(msg_table)
+        prop_blob_idx = col_map.get('PropertyBlob', -1)
 
         # Collect contacts
         vcards = []
@@ -3297,7 +3622,7 @@ a {{ color: #0066cc; }}
                         mailbox_num=self.current_mailbox
                     )
 
-                prop_blob = get_bytes_value(record, col_map.get('PropertyBlob', -1))
+                prop_blob = get_bytes_value(record, prop_blob_idx)
 
                 if email_msg:
                     contact = self._extract_contact_fields(email_msg, prop_blob)
@@ -3409,6 +3734,10 @@ a {{ color: #0066cc; }}
         Returns:
             Full path like "Inbox/Subfolder1/Subfolder2"
         """
+        cached = self._folder_path_cache.get(folder_id)
+        if cached is not None:
+            return cached
+
         path_parts = []
         visited = set()  # Prevent infinite loops
 
@@ -3426,10 +3755,9 @@ a {{ color: #0066cc; }}
             # Move to parent
             current_id = folder.get('parent_id')
 
-        if not path_parts:
-            return "Unknown"
-
-        return "/".join(path_parts)
+        path = "/".join(path_parts) if path_parts else "Unknown"
+        self._folder_path_cache[folder_id] = path
+        return path
 
     def _on_export_mailbox(self):
         """Export entire mailbox with filters to EML files or PST."""
@@ -3548,7 +3876,10 @@ a {{ color: #0066cc; }}
             QMessageBox.warning(self, "Export", "Message table not found")
             return
 
-        col_map = get_column_map(msg_table)
+        col_map = self._cached_msg_col_map or get_column_map(msg_table)
+        hidden_records = self.hidden_records  # IsHidden per record, from the folder scan
+        date_received_idx = col_map.get('DateReceived', -1)
+        prop_blob_idx = col_map.get('PropertyBlob', -1)
 
         # Get all message indices with folder hierarchy paths
         all_indices = []
@@ -3557,127 +3888,140 @@ a {{ color: #0066cc; }}
             for idx in indices:
                 all_indices.append((idx, folder_id, folder_path_str))
 
-        self.progress.setVisible(True)
-        self.progress.setRange(0, len(all_indices))
-
-        exported_eml = 0
-        exported_ics = 0
-        exported_vcf = 0
-        skipped = 0
-        pst_messages = []  # Collect messages for PST mode
-
-        for i, (rec_idx, folder_id, folder_path_str) in enumerate(all_indices):
-            self.progress.setValue(i + 1)
-            if i % 50 == 0:
-                QApplication.processEvents()
+        # Extractors and tables are fixed for the whole export
+        email_extractor = self.email_extractor if HAS_EMAIL_MODULE else None
+        cal_extractor = self.calendar_extractor if HAS_CALENDAR_MODULE else None
+        tables = self.tables
+        mailbox_num = self.current_mailbox
+
+        def export_records(report, status):
+            exported_eml = 0
+            exported_ics = 0
+            exported_vcf = 0
+            skipped = 0
+            pst_messages = []  # Collect messages for PST mode
+            # Write pool only for EML; PST mode collects messages in memory
+            eml_pool = ThreadPoolExecutor(max_workers=EXPORT_WRITE_WORKERS) if export_format == 'eml' else None
+            eml_writes = deque()
+            folder_dirs = {}  # folder_path_str -> created output directory
 
             try:
-                record = msg_table.get_record(rec_idx)
-                if not record:
-                    continue
+                for i, (rec_idx, folder_id, folder_path_str) in enumerate(all_indices):
+                    report(i + 1)
 
-                # Check hidden filter
-                is_hidden = get_bytes_value(record, col_map.get('IsHidden', -1))
-                is_hidden_val = bool(is_hidden and is_hidden != b'\x00')
-                if is_hidden_val and not filter_include_hidden:
-                    skipped += 1
-                    continue
-
-                # Get date
-                date_received = get_filetime_value(record, col_map.get('DateReceived', -1))
-                if date_received:
-                    msg_date = date_received.date()
-                    if msg_date < filter_date_from or msg_date > filter_date_to:
+                    # Check hidden filter before fetching the record
+                    if not filter_include_hidden and rec_idx in hidden_records:
                         skipped += 1
                         continue
 
-                # Extract message data (with attachments)
-                email_msg = None
-                if HAS_EMAIL_MODULE and self.email_extractor:
-                    email_msg = self.email_extractor.extract_message(
-                        record, col_map, rec_idx,
-                        folder_name=folder_path_str,  # Full hierarchy path
-                        tables=self.tables,
-                        mailbox_num=self.current_mailbox
-                    )
-
-                if not email_msg:
-                    skipped += 1
-                    continue
-
-                # Apply text filters
-                from_header = email_msg.get_from_header().lower()
-                to_header = email_msg.get_to_header().lower()
-                subject = (email_msg.subject or "").lower()
-
-                if filter_from_text and filter_from_text not in from_header:
-                    skipped += 1
-                    continue
+                    try:
+                        record = msg_table.get_record(rec_idx)
+                        if not record:
+                            continue
 
-                if filter_to_text and filter_to_text not in to_header:
-                    skipped += 1
-                    continue
+                        # Get date
+                        date_received = get_filetime_value(record, date_received_idx)
+                        if date_received:
+                            msg_date = date_received.date()
+                            if msg_date < filter_date_from or msg_date > filter_date_to:
+                                skipped += 1
+                                continue
+
+                        # Extract message data (with attachments)
+                        email_msg = None
+                        if email_extractor:
+                            email_msg = email_extractor.extract_message(
+                                record, col_map, rec_idx,
+                                folder_name=folder_path_str,  # Full hierarchy path
+                                tables=tables,
+                                mailbox_num=mailbox_num
+                            )
+
+                        if not email_msg:
+                            skipped += 1
+                            continue
 
-                if filter_subject_text and filter_subject_text not in subject:
-                    skipped += 1
-                    continue
+                        # Apply text filters
+                        from_header = email_msg.get_from_header().lower()
+                        to_header = email_msg.get_to_header().lower()
+                        subject = (email_msg.subject or "").lower()
 
-                # Create folder hierarchy directories (EML mode only)
-                if export_format == 'eml':
-                    path_parts = folder_path_str.split('/')
-                    safe_parts = [re.sub(r'[<>:"/\\|?*]', '_', part or 'Unknown') for part in path_parts]
-                    folder_path = mailbox_dir
-                    for part in safe_parts:
-                        folder_path = folder_path / part
-                    folder_path.mkdir(parents=True, exist_ok=True)
+                        if filter_from_text and filter_from_text not in from_header:
+                            skipped += 1
+                            continue
 
-                # Detect message type
-                msg_class = ''
-                if HAS_CALENDAR_MODULE and self.calendar_extractor:
-                    msg_class = self.calendar_extractor.get_message_class(record, col_map)
-                is_cal = (bool(msg_class) and HAS_CALENDAR_MODULE
-                          and self.calendar_extractor.is_calendar_item(msg_class))
-                is_vcf = msg_class.upper().startswith('IPM.CONTACT') if msg_class else False
-
-                date_str = date_received.strftime("%Y%m%d_%H%M%S") if date_received else "nodate"
-                subject_safe = re.sub(r'[<>:"/\\|?*]', '_', email_msg.subject or 'no_subject')[:40]
-
-                if is_cal and export_format == 'eml':
-                    # Export as ICS (EML mode only)
-                    cal_event = self.calendar_extractor.extract_event(record, col_map, rec_idx)
-                    if cal_event:
-                        filename = f"{date_str}_{rec_idx}_{subject_safe}.ics"
-                        out_path = folder_path / filename
-                        with open(out_path, 'w', encoding='utf-8') as f:
-                            f.write(cal_event.to_ics())
-                        exported_ics += 1
-                elif is_vcf and export_format == 'eml':
-                    # Export as VCF (EML mode only)
-                    contact = self._extract_contact_fields(email_msg, get_bytes_value(record, col_map.get('PropertyBlob', -1)))
-                    vcard = self._build_vcard(contact)
-                    if vcard:
-                        name_safe = re.sub(r'[<>:"/\\|?*]', '_', contact.get('name', 'contact'))[:40]
-                        filename = f"{date_str}_{rec_idx}_{name_safe}.vcf"
-                        out_path = folder_path / filename
-                        with open(out_path, 'w', encoding='utf-8') as f:
-                            f.write(vcard)
-                        exported_vcf += 1
-                else:
-                    if export_format == 'pst':
-                        pst_messages.append((email_msg, folder_path_str))
-                    else:
-                        # Export as EML
-                        filename = f"{date_str}_{rec_idx}_{subject_safe}.eml"
-                        eml_content = email_msg.to_eml()
-                        out_path = folder_path / filename
-                        with open(out_path, 'wb') as f:
-                            f.write(eml_content)
-                    exported_eml += 1
+                        if filter_to_text and filter_to_text not in to_header:
+                            skipped += 1
+                            continue
 
-            except Exception as e:
-                self.status.showMessage(f"Error exporting record {rec_idx}: {e}")
+                        if filter_subject_text and filter_subject_text not in subject:
+                            skipped += 1
+                            continue
 
-        self.progress.setVisible(False)
+                        # Create folder hierarchy directories (EML mode only, once per folder)
+                        if export_format == 'eml':
+                            folder_path = folder_dirs.get(folder_path_str)
+                            if folder_path is None:
+                                path_parts = folder_path_str.split('/')
+                                safe_parts = [(part or 'Unknown').translate(_FILENAME_UNSAFE) for part in path_parts]
+                                folder_path = mailbox_dir.joinpath(*safe_parts)
+                                folder_path.mkdir(parents=True, exist_ok=True)
+                                folder_dirs[folder_path_str] = folder_path
+
+                        # Detect message type
+                        msg_class = ''
+                        if cal_extractor:
+                            msg_class = cal_extractor.get_message_class(record, col_map)
+                        is_cal = bool(msg_class) and cal_extractor.is_calendar_item(msg_class)
+                        is_vcf = msg_class.upper().startswith('IPM.CONTACT') if msg_class else False
+
+                        date_str = date_received.strftime("%Y%m%d_%H%M%S") if date_received else "nodate"
+                        subject_safe = (email_msg.subject or 'no_subject').translate(_FILENAME_UNSAFE)[:40]
+
+                        if is_cal and export_format == 'eml':
+                            # Export as ICS (EML mode only)
+                            cal_event = cal_extractor.extract_event(record, col_map, rec_idx)
+                            if cal_event:
+                                filename = f"{date_str}_{rec_idx}_{subject_safe}.ics"
+                                out_path = folder_path / filename
+                                with open(out_path, 'w', encoding='utf-8') as f:
+                                    f.write(cal_event.to_ics())
+                                exported_ics += 1
+                        elif is_vcf and export_format == 'eml':
+                            # Export as VCF (EML mode only)
+                            contact = self._extract_contact_fields(email_msg, get_bytes_value(record, prop_blob_idx))
+                            vcard = self._build_vcard(contact)
+                            if vcard:
+                                name_safe = contact.get('name', 'contact').translate(_FILENAME_UNSAFE)[:40]
+                                filename = f"{date_str}_{rec_idx}_{name_safe}.vcf"
+                                out_path = folder_path / filename
+                                with open(out_path, 'w', encoding='utf-8') as f:
+                                    f.write(vcard)
+                                exported_vcf += 1
+                        else:
+                            if export_format == 'pst':
+                                pst_messages.append((email_msg, folder_path_str))
+                            else:
+                                # Export as EML (serialized and written on the write pool)
+                                filename = f"{date_str}_{rec_idx}_{subject_safe}.eml"
+                                out_path = folder_path / filename
+                                eml_writes.append((rec_idx, eml_pool.submit(write_eml_file, out_path, email_msg)))
+                                if len(eml_writes) >= EXPORT_WRITE_BACKLOG:
+                                    exported_eml -= finish_eml_writes(eml_writes, status, EXPORT_WRITE_BACKLOG // 2)
+                            exported_eml += 1
+
+                    except Exception as e:
+                        status(f"Error exporting record {rec_idx}: {e}")
+
+                exported_eml -= finish_eml_writes(eml_writes, status)
+            finally:
+                if eml_pool:
+                    # Stops the pool threads even if the loop raised; pending writes are dropped
+                    eml_pool.shutdown(cancel_futures=True)
+            return exported_eml, exported_ics, exported_vcf, skipped, pst_messages
+
+        exported_eml, exported_ics, exported_vcf, skipped, pst_messages = self._run_export_worker(
+            export_records, len(all_indices))
 
         # Write PST file if in PST mode
         if export_format == 'pst' and pst_messages:
@@ -3721,10 +4065,9 @@ a {{ color: #0066cc; }}
             return
 
         att = self.current_attachments[idx]
-        filename = att[0]
-        is_external = att[3] if len(att) > 3 else False
+        filename = att.filename
 
-        if is_external:
+        if att.is_external:
             QMessageBox.warning(self, "Save", f"'{filename}' is stored externally and cannot be saved.\nThe database only contains a 4-byte reference.")
             return
 
@@ -3737,12 +4080,11 @@ a {{ color: #0066cc; }}
             return
 
         try:
-            data = self._get_attachment_data(att[4])
+            data = self._get_attachment_data(att.record_idx)
             if not data:
                 QMessageBox.warning(self, "Save", "Could not read attachment data")
                 return
-            with open(path, 'wb') as f:
-                f.write(data)
+            write_bytes_file(path, data)
             self.status.showMessage(f"Saved attachment to {path}")
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save attachment:\n{e}")
@@ -3758,10 +4100,9 @@ a {{ color: #0066cc; }}
             return
 
         att = self.current_attachments[idx]
-        filename = att[0]
-        is_external = att[3] if len(att) > 3 else False
+        filename = att.filename
 
-        if is_external:
+        if att.is_external:
             QMessageBox.warning(self, "Save", f"'{filename}' is stored externally and cannot be saved.\nThe database only contains a 4-byte reference.")
             return
 
@@ -3772,12 +4113,11 @@ a {{ color: #0066cc; }}
 
         if path:
             try:
-                data = self._get_attachment_data(att[4])
+                data = self._get_attachment_data(att.record_idx)
                 if not data:
                     QMessageBox.warning(self, "Save", "Could not read attachment data")
                     return
-                with open(path, 'wb') as f:
-                    f.write(data)
+                write_bytes_file(path, data)
                 self.status.showMessage(f"Saved {filename} to {path}")
             except Exception as e:
                 QMessageBox.critical(self, "Save Error", f"Failed to save attachment:\n{e}")
@@ -3848,6 +4188,11 @@ a {{ color: #0066cc; }}
         dlg.exec()
 
     def closeEvent(self, event):
+        # The export thread still reads records through self.db; closing now would crash it
+        if self._export_worker is not None and self._export_worker.isRunning():
+            self.status.showMessage("Export in progress - wait for it to finish before closing")
+            event.ignore()
+            return
         if self.db:
             self.db.close()
         event.accept()